@@ -0,0 +1,70 @@
+import argparse
+import datetime as dt
+import json
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.report_storage import to_arrow
+from src.responses import FastJSONResponse
+from src.schemas.sentimental_report_schema import SentimentalReportReadPreds
+
+WORDS = ["доставка", "быстро", "ужасно", "вежливый", "курьер", "качество", "цена", "отлично", "вернули", "деньги"]
+
+
+def make_table(rows: int, words: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return to_arrow(pd.DataFrame({
+        "ID": np.arange(rows),
+        "text": [" ".join(rng.choice(WORDS, words)) for _ in range(rows)],
+        "src": rng.choice(["rureviews", "geo", "marketplace"], rows),
+        "label": rng.integers(0, 3, rows),
+    }))
+
+
+def pydantic_path(report_id, created_at, table) -> bytes:
+    # как FastAPI отдаёт response_model: модель на каждую строку, jsonable_encoder, json.dumps
+    report = SentimentalReportReadPreds(id=report_id, created_at=created_at, prediction=table.to_pylist())
+    return JSONResponse(jsonable_encoder(report)).body
+
+
+def fast_path(report_id, created_at, table) -> bytes:
+    return FastJSONResponse({"id": report_id, "created_at": created_at, "prediction": table.to_pylist()}).body
+
+
+def bench(fn, repeat: int, *args) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def main():
+    """
+    Сравнивает время сериализации ответа /reports/json: SentimentalReportReadPreds
+    (как было) и FastJSONResponse по строкам отчёта без валидации.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark /reports/json serialization")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--words", type=int, default=20, help="Слов в тексте строки")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    report_id, created_at = uuid.uuid4(), dt.datetime.now()
+    print(f"{'rows':>8} {'pydantic, s':>12} {'orjson, s':>10} {'speedup':>8} {'MB':>6}")
+    for rows in args.rows:
+        table = make_table(rows, args.words)
+        slow, slow_body = bench(pydantic_path, args.repeat, report_id, created_at, table)
+        fast, fast_body = bench(fast_path, args.repeat, report_id, created_at, table)
+        assert json.loads(slow_body)["prediction"] == json.loads(fast_body)["prediction"]
+        print(f"{rows:>8} {slow:>12.3f} {fast:>10.3f} {slow / fast:>7.1f}x {len(fast_body) / 2 ** 20:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
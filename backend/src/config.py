@@ -11,6 +11,38 @@ class Settings(BaseSettings):
     API_PREFIX: str = os.getenv("API_PREFIX", "/sentimental-api")
     DATA_PATH: str = os.getenv("DATA_PATH", "src/data/")
     JWT_SECRET: str = os.getenv("JWT_SECRET", "meowmeow")
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "1"))
+    INFERENCE_QUEUE_SIZE: int = int(os.getenv("INFERENCE_QUEUE_SIZE", "8"))
+    INFERENCE_TORCH_THREADS: int = int(os.getenv("INFERENCE_TORCH_THREADS", "0"))
+    REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "1"))
+    REPORT_STREAMING: bool = os.getenv("REPORT_STREAMING", "false").lower() == "true"
+    REPORT_CHUNK_ROWS: int = int(os.getenv("REPORT_CHUNK_ROWS", "2048"))
+    REPORT_JOB_HEARTBEAT_SECONDS: float = float(os.getenv("REPORT_JOB_HEARTBEAT_SECONDS", "30"))
+    REPORT_JOB_TIMEOUT_SECONDS: float = float(os.getenv("REPORT_JOB_TIMEOUT_SECONDS", "300"))
+    REPORT_DEDUP: bool = os.getenv("REPORT_DEDUP", "true").lower() == "true"
+    MODEL_VERSION: str = os.getenv("MODEL_VERSION", "")
+    MODEL_QUANTIZATION: str = os.getenv("MODEL_QUANTIZATION", "none")
+    LONG_TEXT_WINDOWS: int = int(os.getenv("LONG_TEXT_WINDOWS", "1"))
+    LONG_TEXT_STRIDE: int = int(os.getenv("LONG_TEXT_STRIDE", "32"))
+    INFERENCE_ENGINE: str = os.getenv("INFERENCE_ENGINE", "torch")
+    RUBERT_WEIGHTS_PATH: str = os.getenv("RUBERT_WEIGHTS_PATH", "src/ml/full_model_weights.pt")
+    ONNX_MODEL_PATH: str = os.getenv("ONNX_MODEL_PATH", "src/ml/rubert.onnx")
+    RNN_WEIGHTS_PATH: str = os.getenv("RNN_WEIGHTS_PATH", "src/ml/rnn/full_model_state.pth")
+    RNN_VOCAB_PATH: str = os.getenv("RNN_VOCAB_PATH", "src/ml/save_data_new.pkl")
+    RNN_ONNX_MODEL_PATH: str = os.getenv("RNN_ONNX_MODEL_PATH", "src/ml/rnn/rnn.onnx")
+    DEFAULT_MODEL: str = os.getenv("DEFAULT_MODEL", "rubert")
+    ENABLED_MODELS: str = os.getenv("ENABLED_MODELS", "rubert,rnn,cascade")
+    CASCADE_THRESHOLD: float = float(os.getenv("CASCADE_THRESHOLD", "0.8"))
+    INFERENCE_MODE: str = os.getenv("INFERENCE_MODE", "local")
+    INFERENCE_SOCKET_PATH: str = os.getenv("INFERENCE_SOCKET_PATH", "/tmp/sentimental-inference.sock")
+    ORT_INTRA_OP_THREADS: int = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))
+    ORT_INTER_OP_THREADS: int = int(os.getenv("ORT_INTER_OP_THREADS", "0"))
+    WEB_WORKERS: int = int(os.getenv("WEB_WORKERS", "1"))
+    MODEL_PRELOAD: bool = os.getenv("MODEL_PRELOAD", "true").lower() == "true"
+    PREDICTION_CACHE_SIZE: int = int(os.getenv("PREDICTION_CACHE_SIZE", "100000"))
+    PREDICTION_CACHE_PATH: str = os.getenv("PREDICTION_CACHE_PATH", "")
+    PREDICT_BATCH_SIZE: int = int(os.getenv("PREDICT_BATCH_SIZE", "32"))
+    PREDICT_BATCH_WAIT_MS: float = float(os.getenv("PREDICT_BATCH_WAIT_MS", "10"))
 
     @computed_field(return_type=str)
     def sync_db_connection(self):
@@ -38,9 +38,52 @@ class SentimentalReport(Base):
     filepath: Mapped[str] = mapped_column(nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     user: Mapped["User"] = relationship(back_populates="sentimental_reports", lazy="selectin")
+    job: Mapped["ReportJob"] = relationship(back_populates="report",
+                                            lazy="selectin",
+                                            cascade="all, delete")
+    upload: Mapped["ReportUpload"] = relationship(back_populates="report",
+                                                  lazy="selectin",
+                                                  cascade="all, delete")
     created_at: Mapped[dt.datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[dt.datetime] = mapped_column(
         server_default=func.now(), onupdate=func.now()
     )
 
 
+class ReportJob(Base):
+    __tablename__ = "report_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True,
+        server_default=text('gen_random_uuid()')
+    )
+    report_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("sentimental_reports.id", ondelete="CASCADE"), unique=True
+    )
+    report: Mapped["SentimentalReport"] = relationship(back_populates="job")
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    total_rows: Mapped[int] = mapped_column(default=0)
+    processed_rows: Mapped[int] = mapped_column(default=0)
+    error: Mapped[str | None]
+    created_at: Mapped[dt.datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[dt.datetime] = mapped_column(
+        server_default=func.now(), onupdate=func.now()
+    )
+
+
+class ReportUpload(Base):
+    """Какой файл и какой моделью размечен отчёт: по ним находятся готовые отчёты с тем же содержимым."""
+
+    __tablename__ = "report_uploads"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        primary_key=True,
+        server_default=text('gen_random_uuid()')
+    )
+    report_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("sentimental_reports.id", ondelete="CASCADE"), unique=True
+    )
+    report: Mapped["SentimentalReport"] = relationship(back_populates="upload")
+    content_hash: Mapped[str] = mapped_column(String(64), index=True)
+    model_version: Mapped[str]
+    created_at: Mapped[dt.datetime] = mapped_column(server_default=func.now())
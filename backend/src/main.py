@@ -1,4 +1,6 @@
+import asyncio
 from fastapi import FastAPI
+from loguru import logger
 from contextlib import asynccontextmanager
 from src.config import config
 
@@ -6,10 +8,33 @@ from fastapi.middleware.cors import CORSMiddleware
 from src.db.initial import create_tables
 
 
+def log_task_error(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.opt(exception=task.exception()).error(f"background task {task.get_name()} failed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    from src.ml.batching import predict_batchers
+    from src.ml.executor import inference_executor, report_executor
+    from src.ml.engines import registry
+    from src.services.report_job_service import watch_stale_jobs
+
     create_tables()
+    # задачи отчётов живут в BackgroundTasks процесса; после перезапуска их некому доделать
+    stale_jobs = asyncio.create_task(watch_stale_jobs())
+    # модели грузятся в фоне: liveness отвечает сразу, readiness - после прогрева
+    if config.MODEL_PRELOAD:
+        app.state.model_preload = asyncio.create_task(asyncio.to_thread(registry.load_all))
+        app.state.model_preload.add_done_callback(log_task_error)
+    for batcher in predict_batchers.values():
+        batcher.start()
     yield
+    stale_jobs.cancel()
+    for batcher in predict_batchers.values():
+        await batcher.stop()
+    inference_executor.shutdown()
+    report_executor.shutdown()
 
 def create_app() -> FastAPI:
     app = FastAPI(docs_url=f'/{config.API_PREFIX}/docs',
@@ -18,10 +43,12 @@ def create_app() -> FastAPI:
     from src.routers.user_router import router as user_router
     from src.routers.sentimental_report_router import router as report_router
     from src.routers.sentimental_router import router as sentimental_router
+    from src.routers.health_router import router as health_router
 
     app.include_router(user_router)
     app.include_router(report_router)
     app.include_router(sentimental_router)
+    app.include_router(health_router)
 
     app.add_middleware(
         CORSMiddleware,
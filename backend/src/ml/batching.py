@@ -0,0 +1,100 @@
+import asyncio
+from functools import partial
+
+from src.config import config
+from src.ml.executor import inference_executor
+from src.ml.engines import registry
+
+
+class MicroBatcher:
+    """
+    Собирает одиночные запросы на предсказание в батчи.
+
+    Тексты, пришедшие в течение max_wait_ms после первого, объединяются
+    (не больше max_batch_size) и прогоняются через модель одним проходом,
+    после чего каждый вызывающий получает свой результат.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 32, max_wait_ms: float = 10):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+
+    async def predict(self, text: str):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # запросы, от которых клиент уже отключился, не считаем
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                preds = await inference_executor.submit(self.predict_fn, [text for text, _ in batch])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (_, future), pred in zip(batch, preds):
+                if not future.done():
+                    future.set_result(pred)
+
+
+def predict_texts(name, texts):
+    # вызывается в потоке инференса, поэтому модель можно загрузить здесь же
+    return registry.get(name).predict(texts)
+
+
+# у каждой модели своя очередь, чтобы в один батч не попадали запросы к разным моделям
+predict_batchers = {
+    name: MicroBatcher(
+        partial(predict_texts, name),
+        max_batch_size=config.PREDICT_BATCH_SIZE,
+        max_wait_ms=config.PREDICT_BATCH_WAIT_MS,
+    )
+    for name in registry.names
+}
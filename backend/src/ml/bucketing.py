@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import torch
+
+from src.config import config
+
+# батчевое кодирование быстрого токенизатора параллелится в Rust, если это не запрещено явно
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+
+class EncodedTexts:
+    """
+    Тексты, закодированные быстрым токенизатором HF целиком.
+
+    Колонка кодируется крупными срезами по chunk_rows строк (один батчевый
+    вызов токенизатора на срез), id складываются в один непрерывный массив
+    int64, отсортированный по длине строки. Батч соседних по длине строк -
+    срез этого массива без копирования, паддинг добавляется только до самой
+    длинной строки батча. index хранит для каждой строки номер исходного текста.
+
+    При max_windows > 1 текст длиннее max_length не обрезается, а режется
+    токенизатором на окна по max_length токенов с перекрытием stride (не больше
+    max_windows окон на текст). Окна - обычные строки массива и попадают в
+    батчи вместе с короткими текстами; логиты окон одного текста потом
+    складываются (см. predict_for_table.predict_encoded).
+    """
+
+    def __init__(self, tokenizer, texts, max_length: int = 128, chunk_rows: int = 8192,
+                 max_windows: int = config.LONG_TEXT_WINDOWS, stride: int = config.LONG_TEXT_STRIDE):
+        texts = [str(text) for text in texts]
+        windows = max_windows > 1
+        input_ids, lengths, sample = [], [], []
+
+        for start in range(0, len(texts), chunk_rows):
+            encoded = tokenizer(
+                texts[start:start + chunk_rows],
+                truncation=True,
+                max_length=max_length,
+                padding="max_length",
+                return_overflowing_tokens=windows,
+                stride=stride if windows else 0,
+                return_tensors="np",
+            )
+            chunk_sample = encoded["overflow_to_sample_mapping"] if windows else np.arange(len(encoded["input_ids"]))
+            # номер окна внутри текста: окна одного текста идут подряд
+            keep = np.arange(len(chunk_sample)) - np.searchsorted(chunk_sample, chunk_sample) < max_windows
+
+            input_ids.append(encoded["input_ids"][keep])
+            lengths.append(encoded["attention_mask"][keep].sum(axis=1))
+            sample.append(chunk_sample[keep] + start)
+
+        self.num_texts = len(texts)
+        input_ids = np.concatenate(input_ids) if input_ids else np.zeros((0, max_length), dtype=np.int64)
+        lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+        sample = np.concatenate(sample) if sample else np.zeros(0, dtype=np.int64)
+
+        order = np.argsort(lengths, kind="stable")
+        self.index = sample[order]
+        self.lengths = lengths[order]
+        width = int(self.lengths[-1]) if len(self.lengths) else 0
+        self.input_ids = np.ascontiguousarray(input_ids[order, :width], dtype=np.int64)
+        # сколько окон у каждого текста; без окон - по одному
+        self.windows = np.bincount(self.index, minlength=self.num_texts)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def batches(self, batch_size: int):
+        """Отдаёт (index, input_ids, attention_mask) для батчей по batch_size строк."""
+        for start in range(0, len(self), batch_size):
+            end = min(start + batch_size, len(self))
+            width = int(self.lengths[end - 1])
+            input_ids = torch.from_numpy(self.input_ids[start:end, :width])
+            attention_mask = torch.from_numpy(np.arange(width) < self.lengths[start:end, None]).long()
+            yield self.index[start:end], input_ids, attention_mask
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text) -> str:
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def file_version(*paths) -> str:
+    """Короткий отпечаток файлов весов: меняется вместе с их размером и временем изменения."""
+    digest = hashlib.sha1()
+    for path in paths:
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{int(stat.st_mtime)}".encode())
+    return digest.hexdigest()[:12]
+
+
+class PredictionCache:
+    """
+    Кэш предсказанных меток по тексту.
+
+    Ключ - sha1 от версии модели и нормализованного текста. Первый уровень -
+    LRU в памяти на max_size записей, второй (если задан disk_path) - sqlite
+    на диске, общий для всех процессов и переживающий перезапуск.
+    """
+
+    def __init__(self, model_version: str, max_size: int = 100_000, disk_path: str | None = None):
+        self.model_version = model_version
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_path = disk_path
+        self._disk = None
+
+        if disk_path:
+            self._connect()
+            # соединение sqlite нельзя использовать после fork (serve с несколькими воркерами)
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _connect(self):
+        self._disk = sqlite3.connect(self._disk_path, check_same_thread=False)
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute("CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, label INTEGER)")
+        self._disk.commit()
+
+    def _after_fork(self):
+        # унаследованное соединение не закрывается: это сняло бы блокировки родителя
+        self._lock = threading.Lock()
+        self._connect()
+
+    def key(self, text) -> str:
+        return hashlib.sha1(f"{self.model_version}\0{normalize_text(text)}".encode()).hexdigest()
+
+    def _remember(self, key: str, label: int):
+        self._memory[key] = label
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts) -> list[int | None]:
+        keys = [self.key(text) for text in texts]
+        labels = [None] * len(keys)
+
+        with self._lock:
+            missed = []
+            for i, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    labels[i] = self._memory[key]
+                else:
+                    missed.append(i)
+
+            if self._disk is not None and missed:
+                found = {}
+                unique_keys = list({keys[i] for i in missed})
+                # sqlite ограничивает число параметров в запросе
+                for start in range(0, len(unique_keys), 500):
+                    part = unique_keys[start:start + 500]
+                    rows = self._disk.execute(
+                        f"SELECT key, label FROM predictions WHERE key IN ({','.join('?' * len(part))})", part
+                    )
+                    found.update(rows.fetchall())
+                for i in missed:
+                    if keys[i] in found:
+                        labels[i] = found[keys[i]]
+                        self._remember(keys[i], labels[i])
+
+            hits = sum(label is not None for label in labels)
+            self.hits += hits
+            self.misses += len(labels) - hits
+
+        return labels
+
+    def put_many(self, texts, labels):
+        items = [(self.key(text), int(label)) for text, label in zip(texts, labels)]
+        with self._lock:
+            for key, label in items:
+                self._remember(key, label)
+            if self._disk is not None:
+                self._disk.executemany("INSERT OR REPLACE INTO predictions (key, label) VALUES (?, ?)", items)
+                self._disk.commit()
+
+    def predict(self, texts, predict_fn) -> list[int]:
+        """
+        Метки для texts: из кэша, а для промахов - через predict_fn(list[str]).
+        Повторяющиеся тексты среди промахов прогоняются через модель один раз.
+        """
+        labels = self.get_many(texts)
+        missed = {}
+        for i, label in enumerate(labels):
+            if label is None:
+                missed.setdefault(normalize_text(texts[i]), []).append(i)
+
+        if missed:
+            missed_texts = [texts[positions[0]] for positions in missed.values()]
+            preds = predict_fn(missed_texts)
+            self.put_many(missed_texts, preds)
+            for positions, pred in zip(missed.values(), preds):
+                for i in positions:
+                    labels[i] = int(pred)
+
+        return labels
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "model_version": self.model_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_size": len(self._memory),
+            "disk": self._disk is not None,
+        }
@@ -0,0 +1,70 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.metrics import f1_score
+
+from src.ml.model import load_model, load_tokenizer
+from src.ml.predict_for_table import predict_texts
+from src.ml.rnn import loader as rnn_loader
+from src.ml.rnn.predict_utils import predict_proba
+
+
+def sweep(rnn_probs, rubert_preds, labels, thresholds):
+    """
+    Для каждого порога: доля текстов, ушедших в ruBERT, и macro-F1 каскада.
+    Обе модели прогоняются по таблице один раз, каскад собирается из их ответов.
+    """
+    rnn_preds = rnn_probs.argmax(axis=1)
+    confidence = rnn_probs.max(axis=1)
+
+    results = []
+    for threshold in thresholds:
+        escalated = confidence < threshold
+        preds = np.where(escalated, rubert_preds, rnn_preds)
+        results.append({
+            "threshold": float(threshold),
+            "escalation_rate": float(escalated.mean()) if len(escalated) else 0.0,
+            "f1_macro": f1_score(labels, preds, average="macro"),
+        })
+    return results
+
+
+def main():
+    """
+    Подбор CASCADE_THRESHOLD на размеченном csv (колонки text, label):
+    печатает долю эскалаций в ruBERT и macro-F1 для сетки порогов.
+    """
+    parser = argparse.ArgumentParser(description="Sweep cascade thresholds: escalation rate vs macro-F1")
+    parser.add_argument("path_to_table")
+    parser.add_argument("--start", type=float, default=0.4)
+    parser.add_argument("--stop", type=float, default=1.0)
+    parser.add_argument("--step", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    table = pd.read_csv(args.path_to_table)
+    texts = table["text"].astype(str).tolist()
+    labels = table["label"].astype(int).to_numpy()
+
+    rnn_tokenizer = rnn_loader.load_tokenizer()
+    rnn_model = rnn_loader.load_model(rnn_tokenizer.word2ind)
+    rnn_probs = predict_proba(rnn_model, rnn_tokenizer, texts, batch_size=args.batch_size)
+    rubert_preds = predict_texts(load_model(), load_tokenizer(), texts, batch_size=args.batch_size)
+
+    print(f"rnn only: macro-F1 {f1_score(labels, rnn_probs.argmax(axis=1), average='macro'):.4f}")
+    print(f"rubert only: macro-F1 {f1_score(labels, rubert_preds, average='macro'):.4f}")
+
+    thresholds = np.arange(args.start, args.stop + args.step / 2, args.step)
+    for result in sweep(rnn_probs, rubert_preds, labels, thresholds):
+        print(f"threshold {result['threshold']:.2f}: escalated {result['escalation_rate']:.1%}, "
+              f"macro-F1 {result['f1_macro']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
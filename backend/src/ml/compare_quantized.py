@@ -0,0 +1,78 @@
+import argparse
+import io
+import time
+from functools import partial
+
+import pandas as pd
+import torch
+from sklearn.metrics import f1_score
+
+from src.ml.model import load_model, load_tokenizer
+from src.ml.predict_for_table import predict_texts
+from src.ml.rnn import loader as rnn_loader
+from src.ml.rnn.predict_utils import predict_texts as rnn_predict_texts
+
+
+def model_size_mb(model) -> float:
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 2 ** 20
+
+
+def evaluate(predict_fn, model, tokenizer, texts, labels, batch_size):
+    started = time.perf_counter()
+    preds = predict_fn(model, tokenizer, texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    return {
+        "size_mb": model_size_mb(model),
+        "seconds": elapsed,
+        "rows_per_sec": len(texts) / elapsed,
+        "f1_macro": f1_score(labels, preds, average="macro"),
+    }
+
+
+def main():
+    """
+    Сравнивает fp32 и int8 модели на размеченном csv (колонки text, label):
+    размер весов, время инференса и macro-F1.
+    """
+    parser = argparse.ArgumentParser(description="Compare fp32 and dynamic int8 ruBERT or LSTM")
+    parser.add_argument("path_to_table")
+    parser.add_argument("--model", choices=["rubert", "rnn"], default="rubert")
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    table = pd.read_csv(args.path_to_table)
+    texts = table["text"].astype(str).tolist()
+    labels = table["label"].astype(int).tolist()
+
+    if args.model == "rnn":
+        tokenizer = rnn_loader.load_tokenizer()
+        predict_fn = partial(rnn_predict_texts, cache=None)
+        load = partial(rnn_loader.load_model, tokenizer.word2ind)
+    else:
+        tokenizer = load_tokenizer()
+        predict_fn = predict_texts
+        load = load_model
+
+    results = {
+        "fp32": evaluate(predict_fn, load("none"), tokenizer, texts, labels, args.batch_size),
+        "int8": evaluate(predict_fn, load("int8"), tokenizer, texts, labels, args.batch_size),
+    }
+
+    for name, result in results.items():
+        print(f"{name}: size {result['size_mb']:.1f} MB, {result['seconds']:.2f} s "
+              f"({result['rows_per_sec']:.1f} rows/s), macro-F1 {result['f1_macro']:.4f}")
+
+    fp32, int8 = results["fp32"], results["int8"]
+    print(f"speedup x{fp32['seconds'] / int8['seconds']:.2f}, "
+          f"size x{fp32['size_mb'] / int8['size_mb']:.2f}, "
+          f"macro-F1 delta {int8['f1_macro'] - fp32['f1_macro']:+.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+import threading
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from fastapi import Header, HTTPException, Query
+
+from src.config import config
+from src.ml.registry import registry
+from src.ml.cache import PredictionCache
+from src.ml.pipeline import run_pipeline
+from src.report_storage import ReportWriter, write_report
+from src.ml.inference_client import InferenceClient
+from src.ml import model as rubert_loader
+from src.ml.rnn import loader as rnn_loader
+from src.ml.rnn import predict_utils as rnn_utils
+from src.ml.predict_label import predict_label
+from src.ml.get_metrics_by_train import get_metrics_by_train, metrics_from_predictions
+from src.ml.predict_for_table import predict_for_table, predict_for_table_stream, predict_texts
+
+
+class RubertEngine:
+    """Дообученный ruBERT: точнее, но заметно дороже LSTM."""
+
+    name = "rubert"
+
+    def __init__(self):
+        self.model = rubert_loader.load_model(config.MODEL_QUANTIZATION, config.INFERENCE_ENGINE)
+        self.tokenizer = rubert_loader.load_tokenizer()
+        self.cache = rubert_loader.prediction_cache
+
+    def warmup(self):
+        rubert_loader.warmup_rubert(self)
+
+    def predict(self, texts) -> list[int]:
+        return predict_label(self.model, self.tokenizer, list(texts), cache=self.cache)
+
+    def get_metrics(self, table):
+        return get_metrics_by_train(self.model, self.tokenizer, table, cache=self.cache)
+
+    def predict_for_table(self, path_to_table, path_to_save, progress=None):
+        predict_for_table(self.model, self.tokenizer, path_to_table, path_to_save, progress=progress, cache=self.cache)
+
+    def predict_for_table_stream(self, path_to_table, path_to_save, chunk_rows=2048, progress=None):
+        predict_for_table_stream(self.model, self.tokenizer, path_to_table, path_to_save, chunk_rows=chunk_rows,
+                                 progress=progress, cache=self.cache)
+
+
+class RnnEngine:
+    """Двунаправленная LSTM (BaseModel): в разы дешевле ruBERT."""
+
+    name = "rnn"
+
+    def __init__(self):
+        self.tokenizer = rnn_loader.load_tokenizer()
+        self.model = rnn_loader.load_model(self.tokenizer.word2ind, config.MODEL_QUANTIZATION, config.INFERENCE_ENGINE)
+        self.cache = rnn_loader.prediction_cache
+
+    def warmup(self):
+        rnn_loader.warmup_rnn(self)
+
+    def predict(self, texts) -> list[int]:
+        return rnn_utils.predict_texts(self.model, self.tokenizer, list(texts), cache=self.cache).tolist()
+
+    def get_metrics(self, table):
+        return rnn_utils.get_metrics_by_train(self.model, self.tokenizer, table)
+
+    def predict_for_table(self, path_to_table, path_to_save, progress=None):
+        rnn_utils.predict_for_table(self.model, self.tokenizer, path_to_table, path_to_save, progress=progress)
+
+    def predict_for_table_stream(self, path_to_table, path_to_save, chunk_rows=2048, progress=None):
+        rnn_utils.predict_for_table_stream(self.model, self.tokenizer, path_to_table, path_to_save,
+                                           chunk_rows=chunk_rows, progress=progress, cache=self.cache)
+
+
+class TextEngine:
+    """
+    Общая часть движков, которые умеют только predict(texts, progress):
+    метрики и разметка таблиц строятся поверх него.
+    """
+
+    def predict(self, texts, progress=None) -> list[int]:
+        raise NotImplementedError
+
+    def get_metrics(self, table, text_col="text", label_col="label"):
+        preds = self.predict(table[text_col].tolist())
+        return metrics_from_predictions(table[label_col].astype(int).tolist(), preds)
+
+    def predict_for_table(self, path_to_table, path_to_save, text_col="text", progress=None):
+        table_df = pd.read_csv(path_to_table)
+        processed_rows = 0
+
+        def on_batch(rows):
+            nonlocal processed_rows
+            processed_rows += rows
+            if progress is not None:
+                progress(processed_rows, len(table_df))
+
+        table_df['label'] = self.predict(table_df[text_col].tolist(), progress=on_batch)
+        write_report(table_df, path_to_save)
+
+    def predict_for_table_stream(self, path_to_table, path_to_save, text_col="text", chunk_rows=2048, progress=None):
+        """Потоковый вариант: чтение, разметка и дозапись отчёта идут параллельно по чанкам."""
+        total_rows = rnn_utils.count_rows(path_to_table) if progress is not None else 0
+
+        def label(chunk):
+            chunk['label'] = self.predict(chunk[text_col].tolist())
+            return chunk
+
+        processed_rows = 0
+
+        def write(chunk):
+            nonlocal processed_rows
+            writer.write(chunk)
+            processed_rows += len(chunk)
+            if progress is not None:
+                progress(processed_rows, total_rows)
+
+        with ReportWriter(path_to_save) as writer:
+            run_pipeline(pd.read_csv(path_to_table, chunksize=chunk_rows), [label], write)
+
+            if processed_rows == 0:
+                writer.write(pd.read_csv(path_to_table, nrows=0).assign(label=[]))
+
+
+class CascadeEngine(TextEngine):
+    """
+    Каскад LSTM -> ruBERT.
+
+    Каждый текст сначала размечает LSTM; тексты, у которых максимум softmax
+    ниже threshold, переразмечаются ruBERT. Порог подбирается через
+    calibrate-cascade под нужную долю эскалаций.
+    """
+
+    name = "cascade"
+
+    def __init__(self, threshold: float = config.CASCADE_THRESHOLD):
+        self.rnn = registry.get(RnnEngine.name)
+        self.rubert = registry.get(RubertEngine.name)
+        self.threshold = threshold
+        self.cache = cascade_cache
+        self.total_rows = 0
+        self.escalated_rows = 0
+        self._lock = threading.Lock()
+
+    def warmup(self):
+        # обе модели каскада уже прогреты при загрузке
+        pass
+
+    def _predict(self, texts, progress=None):
+        probs = rnn_utils.predict_proba(self.rnn.model, self.rnn.tokenizer, texts)
+        labels = probs.argmax(axis=1).astype(np.int64)
+        uncertain = np.flatnonzero(probs.max(axis=1) < self.threshold)
+
+        if progress is not None:
+            progress(len(texts) - len(uncertain))
+        if len(uncertain):
+            labels[uncertain] = predict_texts(
+                self.rubert.model, self.rubert.tokenizer, [texts[i] for i in uncertain], progress=progress
+            )
+
+        with self._lock:
+            self.total_rows += len(texts)
+            self.escalated_rows += len(uncertain)
+        return labels.tolist()
+
+    def predict(self, texts, progress=None) -> list[int]:
+        texts = [str(text) for text in texts]
+        if self.cache is None:
+            return self._predict(texts, progress)
+
+        def predict_missed(missed):
+            if progress is not None:
+                progress(len(texts) - len(missed))
+            return self._predict(missed, progress)
+
+        return self.cache.predict(texts, predict_missed)
+
+    def stats(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "total_rows": self.total_rows,
+            "escalated_rows": self.escalated_rows,
+            "escalation_rate": self.escalated_rows / self.total_rows if self.total_rows else 0.0,
+        }
+
+
+cascade_version = f"cascade-{config.CASCADE_THRESHOLD}-{rnn_loader.model_version}-{rubert_loader.model_version}"
+
+cascade_cache = PredictionCache(
+    model_version=cascade_version,
+    max_size=config.PREDICTION_CACHE_SIZE,
+    disk_path=config.PREDICTION_CACHE_PATH or None,
+) if config.PREDICTION_CACHE_SIZE > 0 else None
+
+class RemoteEngine(TextEngine):
+    """
+    Модель, которая живёт в отдельном процессе inference-server.
+    Веб-воркер держит только соединение, модель и батчинг - на сервере.
+    """
+
+    def __init__(self, name: str, client: InferenceClient, chunk_rows: int = 1024):
+        self.name = name
+        self.client = client
+        self.chunk_rows = chunk_rows
+
+    def warmup(self):
+        # заодно заставляет сервер загрузить модель, так что readiness отражает готовность сервера
+        self.client.predict(self.name, ["прогрев"])
+
+    def predict(self, texts, progress=None) -> list[int]:
+        texts = [str(text) for text in texts]
+        labels = []
+        for start in range(0, len(texts), self.chunk_rows):
+            chunk = texts[start:start + self.chunk_rows]
+            labels.extend(self.client.predict(self.name, chunk))
+            if progress is not None:
+                progress(len(chunk))
+        return labels
+
+
+local_engines = (RubertEngine, RnnEngine, CascadeEngine)
+
+
+def enabled_engines(names: str, default_model: str) -> list:
+    """
+    Движки из ENABLED_MODELS (имена через запятую). Остальные не регистрируются:
+    их не ждёт readiness и не принимает get_model_name - так разворачивается,
+    например, один ruBERT без весов LSTM.
+    """
+    enabled = {name.strip() for name in names.split(",") if name.strip()}
+    unknown = enabled - {engine.name for engine in local_engines}
+    if unknown:
+        raise ValueError(f"Unknown models in ENABLED_MODELS: {', '.join(sorted(unknown))}")
+    if CascadeEngine.name in enabled and not {RnnEngine.name, RubertEngine.name} <= enabled:
+        raise ValueError("cascade needs rnn and rubert in ENABLED_MODELS")
+    if default_model not in enabled:
+        raise ValueError(f"DEFAULT_MODEL={default_model} is not in ENABLED_MODELS")
+    return [engine for engine in local_engines if engine.name in enabled]
+
+
+if config.INFERENCE_MODE == "remote":
+    inference_client = InferenceClient(config.INFERENCE_SOCKET_PATH)
+    for engine in enabled_engines(config.ENABLED_MODELS, config.DEFAULT_MODEL):
+        registry.register(engine.name, partial(RemoteEngine, engine.name, inference_client), RemoteEngine.warmup)
+else:
+    for engine in enabled_engines(config.ENABLED_MODELS, config.DEFAULT_MODEL):
+        registry.register(engine.name, engine, engine.warmup)
+
+caches = {
+    RubertEngine.name: rubert_loader.prediction_cache,
+    RnnEngine.name: rnn_loader.prediction_cache,
+    CascadeEngine.name: cascade_cache,
+}
+
+# версия модели входит в ключ дедупликации отчётов: после смены весов файл размечается заново
+model_versions = {
+    RubertEngine.name: rubert_loader.model_version,
+    RnnEngine.name: rnn_loader.model_version,
+    CascadeEngine.name: cascade_version,
+}
+
+
+def get_model_name(
+    model: str | None = Query(None, description="Модель для предсказания: rubert, rnn или cascade"),
+    x_model: str | None = Header(None),
+) -> str:
+    """Имя модели из query-параметра model или заголовка X-Model, иначе DEFAULT_MODEL."""
+    name = model or x_model or config.DEFAULT_MODEL
+    if name not in registry.names:
+        raise HTTPException(400, f"Unknown model: {name}. Available: {', '.join(registry.names)}")
+    return name
@@ -0,0 +1,69 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from fastapi import HTTPException
+
+from src.config import config
+
+
+class InferenceQueueFull(HTTPException):
+    def __init__(self):
+        super().__init__(503, "Inference queue is full, try again later")
+
+
+class InferenceExecutor:
+    """
+    Выполняет блокирующий инференс torch вне event loop.
+
+    Одновременно работают не больше max_workers задач, ещё max_queue
+    ждут своей очереди; всё сверх этого сразу отклоняется с 503.
+    max_queue=None - очередь без ограничения, задачи не отклоняются.
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue: int | None = 8, torch_threads: int = 0,
+                 thread_name_prefix: str = "inference"):
+        if torch_threads > 0:
+            torch.set_num_threads(torch_threads)
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    async def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self.max_queue is not None and self._pending >= self.max_workers + self.max_queue:
+                raise InferenceQueueFull()
+            self._pending += 1
+
+        # слот освобождается, когда задача реально закончилась в пуле,
+        # даже если ожидающий её запрос уже отменён
+        future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+inference_executor = InferenceExecutor(
+    max_workers=config.INFERENCE_WORKERS,
+    max_queue=config.INFERENCE_QUEUE_SIZE,
+    torch_threads=config.INFERENCE_TORCH_THREADS,
+)
+
+# отчёты - отдельный пул без отказов: принятый файл ждёт своей очереди, а не падает
+# с 503, и не занимает воркеры, на которых идут интерактивные запросы
+report_executor = InferenceExecutor(max_workers=config.REPORT_WORKERS, max_queue=None, thread_name_prefix="report")
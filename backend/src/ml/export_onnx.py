@@ -0,0 +1,94 @@
+import argparse
+
+import torch
+import torch.nn as nn
+
+from src.config import config
+from src.ml.model import load_model, load_tokenizer
+from src.ml.rnn import loader as rnn_loader
+
+
+class LogitsOnly(nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+class PackedLSTM(nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, lengths):
+        return self.model.forward_packed(input_ids, lengths)
+
+
+def export_onnx(path: str, opset: int = 17):
+    """
+    Экспортирует дообученный ruBERT в ONNX с динамическими осями batch и sequence.
+    """
+    model = LogitsOnly(load_model("none")).eval()
+    sample = load_tokenizer()(["Пример отзыва", "Ещё один отзыв подлиннее"], padding=True, return_tensors="pt")
+
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=opset,
+        dynamo=False,
+    )
+
+
+def export_rnn_onnx(path: str, opset: int = 17):
+    """
+    Экспортирует LSTM BaseModel.forward_packed в ONNX с динамическими осями batch и sequence.
+    """
+    word2ind = rnn_loader.load_vocab()
+    model = PackedLSTM(rnn_loader.load_model(word2ind, "none")).eval()
+    sample = torch.full((2, 16), word2ind['<pad>'], dtype=torch.long)
+    lengths = torch.tensor([16, 9], dtype=torch.long)
+
+    torch.onnx.export(
+        model,
+        (sample, lengths),
+        path,
+        input_names=["input_ids", "lengths"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "lengths": {0: "batch"},
+            "logits": {0: "batch"},
+        },
+        opset_version=opset,
+        dynamo=False,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export ruBERT or the LSTM to ONNX")
+    parser.add_argument("--model", choices=["rubert", "rnn"], default="rubert")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    if args.model == "rnn":
+        output = args.output or config.RNN_ONNX_MODEL_PATH
+        export_rnn_onnx(output, args.opset)
+    else:
+        output = args.output or config.ONNX_MODEL_PATH
+        export_onnx(output, args.opset)
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 import torch
-from torch.utils.data import Dataset, DataLoader, TensorDataset
 from tqdm.auto import tqdm
 from sklearn.metrics import precision_recall_fscore_support
 import pandas as pd
-from src.ml.model import model, tokenizer
+from src.ml.model import prediction_cache
+from src.ml.bucketing import EncodedTexts
+from src.ml.predict_for_table import predict_encoded
 
 device = 'cpu'
 batch_size=32
@@ -11,60 +12,37 @@ max_length=128
 text_col="text"
 label_col="label"
 
-class DataFrameTextDataset(Dataset):
-    def __init__(self, df: pd.DataFrame, text_col="text", label_col="label"):
-        self.texts = df[text_col].tolist()
-        self.labels = df[label_col].tolist()
-
-    def __len__(self):
-        return len(self.texts)
-
-    def __getitem__(self, idx):
-        return self.texts[idx], self.labels[idx]
-
-def collate_batch(batch, tokenizer, max_length):
-    texts, labels = zip(*batch)
-    encoded = tokenizer(
-        list(texts),
-        padding="max_length",
-        truncation=True,
-        max_length=max_length,
-        return_tensors="pt"
-    )
-    labels = torch.tensor(labels, dtype=torch.long)
-    return encoded["input_ids"], encoded["attention_mask"], labels
-
-def get_metrics_by_train(model, table):
+def get_metrics_by_train(model, tokenizer, table, cache=prediction_cache):
     """
     Вычисляет precision, recall, f1 для каждого класса на DataFrame.
+    Через модель идут только тексты, которых нет в cache.
     """
     model.eval()
-    dataset = DataFrameTextDataset(table, text_col=text_col, label_col=label_col)
-    dataloader = DataLoader(
-        dataset,
-        batch_size=batch_size,
-        shuffle=False,
-        collate_fn=lambda b: collate_batch(b, tokenizer, max_length)
-    )
+    texts = table[text_col].astype(str).tolist()
+    cached = cache.get_many(texts) if cache is not None else [None] * len(texts)
+    hit = [i for i, label in enumerate(cached) if label is not None]
+    missed = [i for i, label in enumerate(cached) if label is None]
+
+    all_preds = [cached[i] for i in hit]
+    all_labels = table[label_col].iloc[hit].tolist()
+    if not missed:
+        return metrics_from_predictions(all_labels, all_preds)
+
+    missed_texts = [texts[i] for i in missed]
+    encoded = EncodedTexts(tokenizer, missed_texts, max_length=max_length)
 
-    all_preds = []
-    all_labels = []
+    with tqdm(total=len(missed_texts), desc="Evaluating") as bar:
+        preds = predict_encoded(model, encoded, batch_size=batch_size, progress=bar.update)
 
-    with torch.no_grad():
-        for input_ids, attention_mask, labels in tqdm(dataloader, desc="Evaluating"):
-            input_ids = input_ids.to(device)
-            attention_mask = attention_mask.to(device)
-            labels = labels.to(device)
+    all_preds.extend(preds.tolist())
+    all_labels.extend(table[label_col].iloc[missed].tolist())
+    if cache is not None:
+        cache.put_many(missed_texts, preds)
 
-            outputs = model(
-                input_ids=input_ids,
-                attention_mask=attention_mask
-            )
-            preds = torch.argmax(outputs.logits, dim=1)
+    return metrics_from_predictions(all_labels, all_preds)
 
-            all_preds.extend(preds.cpu().tolist())
-            all_labels.extend(labels.cpu().tolist())
 
+def metrics_from_predictions(all_labels, all_preds):
     precision, recall, f1, support = precision_recall_fscore_support(
         all_labels, all_preds, average=None
     )
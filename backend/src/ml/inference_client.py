@@ -0,0 +1,77 @@
+import itertools
+import socket
+import threading
+
+from fastapi import HTTPException
+
+from src.ml.protocol import decode_response, encode_request, frame, recv_frame
+
+
+class InferenceClient:
+    """
+    Блокирующий клиент inference-сервера по unix-сокету.
+
+    У каждого потока своё соединение и не больше одного запроса в полёте,
+    поэтому вызывать predict нужно из потоков inference_executor.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 600):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    def _socket(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def predict(self, model: str, texts) -> list[int]:
+        request_id = next(self._ids) % 2 ** 32
+        request = frame(encode_request(request_id, model, texts))
+
+        # одна повторная попытка, только если запрос не дошёл до сервера: он мог
+        # перезапуститься между запросами. Недописанный кадр сервер не выполняет,
+        # а таймаут или обрыв во время ответа не повторяются - сервер, возможно,
+        # ещё считает этот запрос
+        for attempt in range(2):
+            try:
+                sock = self._socket()
+                sock.sendall(request)
+                break
+            except TimeoutError:
+                self._close()
+                raise HTTPException(504, "Inference server timed out")
+            except (FileNotFoundError, ConnectionRefusedError, ConnectionResetError, BrokenPipeError):
+                self._close()
+                if attempt:
+                    raise HTTPException(503, "Inference server is unavailable")
+            except OSError:
+                self._close()
+                raise HTTPException(503, "Inference server is unavailable")
+
+        try:
+            response_id, status, result = decode_response(recv_frame(sock))
+        except TimeoutError:
+            self._close()
+            raise HTTPException(504, "Inference server timed out")
+        except OSError:
+            self._close()
+            raise HTTPException(503, "Inference server is unavailable")
+
+        if response_id != request_id:
+            self._close()
+            raise HTTPException(502, "Inference server answered out of order")
+        if status != 200:
+            raise HTTPException(status, result)
+        return result
@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import os
+
+from fastapi import HTTPException
+from loguru import logger
+
+from src.config import config
+from src.ml.protocol import ProtocolError, decode_request, encode_error, encode_response, frame, read_frame
+
+
+class InferenceServer:
+    """
+    Отдельный процесс, который владеет моделями и обслуживает веб-воркеры
+    по unix-сокету (протокол - src.ml.protocol).
+
+    Одиночные тексты от всех клиентов собираются в общие батчи через
+    predict_batchers. Пачки текстов (отчёты и метрики, которые веб-воркер уже
+    принял) идут в report_executor без отказов по очереди и внутри
+    engine.predict режутся на батчи не больше PREDICT_BATCH_SIZE.
+    """
+
+    def __init__(self, socket_path: str):
+        # импорты здесь: в этом процессе модели должны быть локальными
+        from src.ml.batching import predict_batchers
+        from src.ml.engines import registry
+        from src.ml.executor import inference_executor, report_executor
+
+        self.socket_path = socket_path
+        self.batchers = predict_batchers
+        self.registry = registry
+        self.executor = inference_executor
+        self.report_executor = report_executor
+
+    async def predict(self, model: str, texts: list[str]) -> list[int]:
+        if model not in self.batchers:
+            raise HTTPException(404, f"Unknown model: {model}")
+        if len(texts) == 1:
+            return [await self.batchers[model].predict(texts[0])]
+        engine = await self.registry.aget(model)
+        return await self.report_executor.submit(engine.predict, texts)
+
+    async def respond(self, payload: bytes, writer, write_lock: asyncio.Lock):
+        request_id = 0
+        try:
+            request_id, model, texts = decode_request(payload)
+            response = encode_response(request_id, await self.predict(model, texts))
+        except HTTPException as exc:
+            response = encode_error(request_id, exc.status_code, str(exc.detail))
+        except Exception as exc:
+            logger.exception("inference request failed")
+            response = encode_error(request_id, 500, repr(exc))
+
+        async with write_lock:
+            writer.write(frame(response))
+            await writer.drain()
+
+    async def handle(self, reader, writer):
+        # ответы на запросы одного клиента могут уходить не по порядку, их связывает request_id
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while (payload := await read_frame(reader)) is not None:
+                task = asyncio.create_task(self.respond(payload, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, ProtocolError) as exc:
+            logger.warning(f"client dropped: {exc!r}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        for batcher in self.batchers.values():
+            batcher.start()
+        if config.MODEL_PRELOAD:
+            await asyncio.to_thread(self.registry.load_all)
+
+        server = await asyncio.start_unix_server(self.handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"inference server listening on {self.socket_path}, models: {self.registry.status()}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for batcher in self.batchers.values():
+                await batcher.stop()
+            self.executor.shutdown()
+            self.report_executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the model inference server on a unix socket")
+    parser.add_argument("--socket", default=config.INFERENCE_SOCKET_PATH)
+    args = parser.parse_args()
+
+    # сервер сам держит модели, даже если в окружении веб-воркеров INFERENCE_MODE=remote
+    config.INFERENCE_MODE = "local"
+    asyncio.run(InferenceServer(args.socket).serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,58 @@
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
 import torch
+from src.config import config
+from src.ml.cache import PredictionCache, file_version
+from src.ml.quantization import quantize_dynamic_int8
+from src.ml.weights import load_weights
 
 device = 'cpu'
 
-model = AutoModelForSequenceClassification.from_pretrained("src/ml/rubert_local").to(device)
 
-state_dict = torch.load("src/ml/full_model_weights.pt", map_location=device)
-model.load_state_dict(state_dict)
-model.eval()
+def load_model(quantization: str = "none", engine: str = "torch", model_dir: str = "src/ml/rubert_local"):
+    if engine == "onnx":
+        from src.ml.onnx_engine import OnnxSequenceClassifier
 
-tokenizer = AutoTokenizer.from_pretrained("src/ml/rubert_tokenizer_local")
\ No newline at end of file
+        return OnnxSequenceClassifier(
+            config.ONNX_MODEL_PATH,
+            intra_op_threads=config.ORT_INTRA_OP_THREADS,
+            inter_op_threads=config.ORT_INTER_OP_THREADS,
+        )
+
+    # из rubert_local берётся только конфиг: базовые веса не читаются, дообученные
+    # подставляются с assign=True и остаются ссылками на mmap-страницы файла
+    model = AutoModelForSequenceClassification.from_config(AutoConfig.from_pretrained(model_dir))
+    model.load_state_dict(load_weights(config.RUBERT_WEIGHTS_PATH), assign=True)
+    model.eval()
+
+    if quantization == "int8":
+        model = quantize_dynamic_int8(model)
+    return model
+
+
+def load_tokenizer():
+    return AutoTokenizer.from_pretrained("src/ml/rubert_tokenizer_local")
+
+
+def warmup_rubert(rubert, batch_sizes=(1, config.PREDICT_BATCH_SIZE), lengths=(16, 64, 128)):
+    """Прогоняет модель на типичных размерах батча, чтобы первые запросы не платили за инициализацию."""
+    with torch.no_grad():
+        for batch_size in batch_sizes:
+            for length in lengths:
+                input_ids = torch.full((batch_size, length), rubert.tokenizer.unk_token_id, dtype=torch.long)
+                attention_mask = torch.ones_like(input_ids)
+                rubert.model(input_ids=input_ids, attention_mask=attention_mask)
+
+
+model_version = "rubert-" + (config.MODEL_VERSION or file_version(config.RUBERT_WEIGHTS_PATH))
+if config.INFERENCE_ENGINE == "onnx":
+    model_version += "-onnx-" + file_version(config.ONNX_MODEL_PATH)
+elif config.MODEL_QUANTIZATION != "none":
+    model_version += "-" + config.MODEL_QUANTIZATION
+if config.LONG_TEXT_WINDOWS > 1:
+    model_version += f"-windows{config.LONG_TEXT_WINDOWS}x{config.LONG_TEXT_STRIDE}"
+
+prediction_cache = PredictionCache(
+    model_version=model_version,
+    max_size=config.PREDICTION_CACHE_SIZE,
+    disk_path=config.PREDICTION_CACHE_PATH or None,
+) if config.PREDICTION_CACHE_SIZE > 0 else None
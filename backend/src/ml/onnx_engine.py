@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import numpy as np
+import onnxruntime as ort
+import torch
+
+
+class OnnxEngine:
+    """
+    Инференс ONNX-графа через onnxruntime на CPU.
+    Сама сессия работает с numpy-массивами; обёртки ниже отдают логиты
+    тензорами torch, как заменяемые ими модели, так что torch по-прежнему
+    нужен остальному пайплайну предсказаний.
+    """
+
+    def __init__(self, path: str, intra_op_threads: int = 0, inter_op_threads: int = 0):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads > 0:
+            options.inter_op_num_threads = inter_op_threads
+
+        self.path = path
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def run(self, **inputs) -> np.ndarray:
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+        return self.session.run(["logits"], feed)[0]
+
+
+class OnnxSequenceClassifier(OnnxEngine):
+    """
+    Замена AutoModelForSequenceClassification для predict_label, predict_for_table
+    и get_metrics_by_train: тот же вызов model(input_ids=..., attention_mask=...).logits.
+    """
+
+    def __call__(self, input_ids, attention_mask):
+        logits = self.run(input_ids=input_ids, attention_mask=attention_mask)
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+
+class OnnxBaseModel(OnnxEngine):
+    """
+    Замена BaseModel (LSTM) для src.ml.rnn.predict_utils:
+    тот же вызов model.forward_packed(input_ids, lengths) -> logits.
+    """
+
+    def __init__(self, path: str, intra_op_threads: int = 0, inter_op_threads: int = 0):
+        super().__init__(path, intra_op_threads, inter_op_threads)
+        if "lengths" not in self.input_names:
+            raise RuntimeError(f"{path} has no lengths input, re-export it with `export-onnx --model rnn`")
+
+    def forward_packed(self, input_ids, lengths):
+        return torch.from_numpy(self.run(input_ids=input_ids, lengths=lengths))
+
+    def __call__(self, input_batch):
+        lengths = torch.full((input_batch.shape[0],), input_batch.shape[1], dtype=torch.long)
+        return self.forward_packed(input_batch, lengths)
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
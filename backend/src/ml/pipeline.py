@@ -0,0 +1,83 @@
+import queue
+import threading
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def run_pipeline(source, stages, sink, queue_size: int = 2):
+    """
+    Прогоняет элементы source через цепочку stages и отдаёт результаты в sink.
+
+    Чтение source и каждая стадия работают в своих потоках, sink вызывается
+    в текущем. Стадии связаны очередями на queue_size элементов, так что в
+    памяти одновременно живёт ограниченное число элементов. Исключение в любой
+    стадии останавливает конвейер и пробрасывается вызывающему.
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+
+    def put(q, item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def read():
+        try:
+            for item in source:
+                if not put(queues[0], item):
+                    return
+            put(queues[0], _DONE)
+        except BaseException as exc:
+            put(queues[0], _Failure(exc))
+
+    def work(stage, q_in, q_out):
+        while True:
+            item = get(q_in)
+            if item is _DONE or isinstance(item, _Failure):
+                put(q_out, item)
+                return
+            try:
+                result = stage(item)
+            except BaseException as exc:
+                put(q_out, _Failure(exc))
+                return
+            if not put(q_out, result):
+                return
+
+    threads = [threading.Thread(target=read, daemon=True)]
+    threads += [
+        threading.Thread(target=work, args=(stage, queues[i], queues[i + 1]), daemon=True)
+        for i, stage in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.exc
+            sink(item)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
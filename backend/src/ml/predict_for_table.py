@@ -1,69 +1,130 @@
 import pandas as pd
 import numpy as np
 import torch
-from torch.utils.data import Dataset, DataLoader
-from src.ml.model import model, tokenizer
-
-
-class CustomDataset(Dataset):
-    def __init__(self, table_array, tokenizer, max_length=128, is_train=False):
-        self.texts = table_array[:, 0]  # предполагаем, что текст в первом столбце
-        self.is_train = is_train
-        self.tokenizer = tokenizer
-        self.max_length = max_length
-
-        if self.is_train:
-            self.labels = table_array[:, 1].astype(int)  # если есть метки
-
-    def __len__(self):
-        return len(self.texts)
-
-    def __getitem__(self, idx):
-        encoded = self.tokenizer(
-            str(self.texts[idx]),
-            padding="max_length",
-            truncation=True,
-            max_length=self.max_length,
-            return_tensors="pt"
-        )
-        item = {
-            "input_ids": encoded["input_ids"].squeeze(0),
-            "attention_mask": encoded["attention_mask"].squeeze(0)
-        }
-        if self.is_train:
-            item["labels"] = torch.tensor(self.labels[idx], dtype=torch.long)
-        return item
-
-
-def collate_fn_with_padding(batch):
-    input_ids = torch.stack([x['input_ids'] for x in batch])
-    attention_mask = torch.stack([x['attention_mask'] for x in batch])
-    return {"input_ids": input_ids, "attention_mask": attention_mask}
-
-
-def predict_for_table(model, tokenizer, path_to_table, path_to_save, max_length=128, batch_size=20):
+from src.ml.model import prediction_cache, device
+from src.ml.bucketing import EncodedTexts
+from src.ml.pipeline import run_pipeline
+from src.report_storage import ReportWriter, write_report
+
+
+def predict_encoded(model, encoded, batch_size=20, progress=None):
+    """
+    Метки для текстов EncodedTexts в исходном порядке.
+    Логиты окон длинного текста суммируются, метка - argmax суммы.
+    progress(rows) вызывается после каждого батча с числом полностью размеченных текстов.
+    """
+    logits = None
+    remaining = encoded.windows.copy()
+
+    # батчи идут в порядке длины, поэтому раскладываем предсказания по исходным индексам
+    with torch.no_grad():
+        for index, input_ids, attention_mask in encoded.batches(batch_size):
+            outputs = model(input_ids=input_ids.to(device), attention_mask=attention_mask.to(device))
+            batch_logits = outputs.logits.float().cpu().numpy()
+            if logits is None:
+                logits = np.zeros((encoded.num_texts, batch_logits.shape[1]), dtype=np.float32)
+            np.add.at(logits, index, batch_logits)
+
+            if progress is not None:
+                np.subtract.at(remaining, index, 1)
+                progress(int(np.count_nonzero(remaining[np.unique(index)] == 0)))
+
+    if logits is None:
+        return np.zeros(encoded.num_texts, dtype=np.int64)
+    return logits.argmax(axis=1).astype(np.int64)
+
+
+def predict_texts(model, tokenizer, texts, max_length=128, batch_size=20, progress=None):
+    """
+    Метки для списка текстов в исходном порядке.
+    progress(rows) вызывается после каждого батча с числом обработанных строк.
+    """
+    if not len(texts):
+        return np.zeros(0, dtype=np.int64)
+
+    encoded = EncodedTexts(tokenizer, texts, max_length=max_length)
+    return predict_encoded(model, encoded, batch_size=batch_size, progress=progress)
+
+
+def predict_for_table(model, tokenizer, path_to_table, path_to_save, max_length=128, batch_size=20, text_col="text",
+                      progress=None, cache=prediction_cache):
+    """
+    Размечает таблицу и сохраняет её с колонкой label.
+    progress(processed_rows, total_rows) вызывается после каждого батча.
+    Через модель идут только тексты, которых нет в cache.
+    """
     model.eval()
-    device = next(model.parameters()).device
 
     table_df = pd.read_csv(path_to_table)
-    table_array = np.array(table_df)
-
-    val_dataset = CustomDataset(table_array, tokenizer, max_length=max_length, is_train=False)
-    val_dataloader = DataLoader(val_dataset, batch_size=batch_size, shuffle=False, collate_fn=collate_fn_with_padding)
-
-    all_predictions = []
-
-    with torch.no_grad():
-        for batch in val_dataloader:
-            input_ids = batch['input_ids'].to(device)
-            attention_mask = batch['attention_mask'].to(device)
-
-            outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-            preds = outputs.logits.argmax(dim=1)
-            all_predictions.append(preds.cpu())
-
-    all_predictions = torch.cat(all_predictions, dim=0).numpy()
-    table_df['label'] = all_predictions
-    table_df.to_csv(path_to_save, index=False)
-
-#predict_for_table(model, tokenizer, "./test_first_1000.csv", "predicted_table.csv")
\ No newline at end of file
+    texts = table_df[text_col].astype(str).tolist()
+    processed_rows = 0
+
+    def on_batch(rows):
+        nonlocal processed_rows
+        processed_rows += rows
+        if progress is not None:
+            progress(processed_rows, len(texts))
+
+    def predict_missed(missed):
+        on_batch(len(texts) - len(missed))
+        return predict_texts(model, tokenizer, missed, max_length=max_length, batch_size=batch_size,
+                             progress=on_batch)
+
+    if cache is not None:
+        table_df['label'] = cache.predict(texts, predict_missed)
+    else:
+        table_df['label'] = predict_missed(texts)
+    write_report(table_df, path_to_save)
+
+
+def count_rows(path_to_table, chunk_rows=10_000):
+    return sum(len(chunk) for chunk in pd.read_csv(path_to_table, usecols=[0], chunksize=chunk_rows))
+
+
+def predict_for_table_stream(model, tokenizer, path_to_table, path_to_save, max_length=128, batch_size=20,
+                             text_col="text", chunk_rows=2048, queue_size=2, progress=None,
+                             cache=prediction_cache):
+    """
+    Потоковый вариант predict_for_table с постоянным расходом памяти.
+
+    Таблица читается чанками по chunk_rows строк; чтение, токенизация, инференс
+    и дозапись результата в parquet идут параллельно, связанные очередями на
+    queue_size чанков. Отчёт пишется через ReportWriter и появляется в
+    path_to_save только целиком.
+    """
+    model.eval()
+    total_rows = count_rows(path_to_table) if progress is not None else 0
+
+    def tokenize(chunk):
+        texts = chunk[text_col].astype(str).tolist()
+        labels = cache.get_many(texts) if cache is not None else [None] * len(texts)
+        missed = [i for i, label in enumerate(labels) if label is None]
+        missed_texts = [texts[i] for i in missed]
+        return chunk, labels, missed, missed_texts, EncodedTexts(tokenizer, missed_texts, max_length=max_length)
+
+    def infer(item):
+        chunk, labels, missed, missed_texts, encoded = item
+        preds = predict_encoded(model, encoded, batch_size=batch_size)
+        for i, pred in zip(missed, preds):
+            labels[i] = int(pred)
+        if cache is not None and missed:
+            cache.put_many(missed_texts, preds)
+        chunk['label'] = labels
+        return chunk
+
+    processed_rows = 0
+
+    def write(chunk):
+        nonlocal processed_rows
+        writer.write(chunk)
+        processed_rows += len(chunk)
+        if progress is not None:
+            progress(processed_rows, total_rows)
+
+    with ReportWriter(path_to_save) as writer:
+        run_pipeline(pd.read_csv(path_to_table, chunksize=chunk_rows), [tokenize, infer], write, queue_size=queue_size)
+
+        if processed_rows == 0:
+            writer.write(pd.read_csv(path_to_table, nrows=0).assign(label=[]))
+
+#predict_for_table(model, tokenizer, "./test_first_1000.csv", "predicted_table.csv")
@@ -2,33 +2,32 @@ import torch
 import numpy as np
 from torch.utils.data import DataLoader
 import pandas as pd
-from src.ml.model import model, tokenizer
+from src.ml.model import prediction_cache
+from src.config import config
+from src.ml.predict_for_table import predict_texts
 
 device = 'cpu'
 
-def predict_label(model, tokenizer, texts, device="cpu", max_length=128):
+def predict_label(model, tokenizer, texts, device="cpu", max_length=128, cache=prediction_cache,
+                  batch_size=config.PREDICT_BATCH_SIZE):
     # Если передан одиночный текст, преобразуем в список
     single_input = False
     if isinstance(texts, str):
         texts = [texts]
         single_input = True
 
-    encoded = tokenizer(
-        texts,
-        padding="max_length",
-        truncation=True,
-        max_length=max_length,
-        return_tensors="pt"
-    )
-
-    input_ids = encoded["input_ids"].to(device)
-    attention_mask = encoded["attention_mask"].to(device)
+    if cache is not None:
+        preds = cache.predict(
+            texts,
+            lambda missed: predict_label(model, tokenizer, missed, device=device, max_length=max_length, cache=None,
+                                         batch_size=batch_size)
+        )
+        return preds[0] if single_input else preds
 
+    # паддинг только до самого длинного текста, длинные тексты - окнами при LONG_TEXT_WINDOWS > 1.
+    # Батч микробатчера проходит через модель за раз, большие пачки (inference-server) - батчами по batch_size
     model.eval()
-    with torch.no_grad():
-        outputs = model(input_ids=input_ids, attention_mask=attention_mask)
-        logits = outputs.logits
-        preds = torch.argmax(logits, dim=1).cpu().tolist()
+    preds = predict_texts(model, tokenizer, texts, max_length=max_length, batch_size=batch_size).tolist()
 
     if single_input:
         return preds[0]
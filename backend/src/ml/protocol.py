@@ -0,0 +1,103 @@
+import struct
+
+# кадр: длина полезной нагрузки (u32) + нагрузка
+FRAME_HEADER = struct.Struct("!I")
+# запрос: request_id (u32), длина имени модели (u8), число текстов (u32)
+REQUEST_HEADER = struct.Struct("!IBI")
+# ответ: request_id (u32), статус в терминах HTTP (u16)
+RESPONSE_HEADER = struct.Struct("!IH")
+MAX_FRAME_SIZE = 256 * 2 ** 20
+
+STATUS_OK = 200
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def encode_request(request_id: int, model: str, texts) -> bytes:
+    """
+    Запрос на разметку: заголовок, имя модели, длины текстов (u32 каждая)
+    и тексты в UTF-8 одним блоком.
+    """
+    model = model.encode()
+    texts = [str(text).encode() for text in texts]
+    return b"".join([
+        REQUEST_HEADER.pack(request_id, len(model), len(texts)),
+        model,
+        struct.pack(f"!{len(texts)}I", *map(len, texts)),
+        *texts,
+    ])
+
+
+def decode_request(payload: bytes) -> tuple[int, str, list[str]]:
+    request_id, model_size, count = REQUEST_HEADER.unpack_from(payload)
+    offset = REQUEST_HEADER.size
+    model = payload[offset:offset + model_size].decode()
+    offset += model_size
+
+    lengths = struct.unpack_from(f"!{count}I", payload, offset)
+    offset += 4 * count
+    texts = []
+    for length in lengths:
+        texts.append(payload[offset:offset + length].decode())
+        offset += length
+
+    if offset != len(payload):
+        raise ProtocolError("Malformed request")
+    return request_id, model, texts
+
+
+def encode_response(request_id: int, labels) -> bytes:
+    """Метки классов, по байту (i8) на текст."""
+    labels = [int(label) for label in labels]
+    return RESPONSE_HEADER.pack(request_id, STATUS_OK) + struct.pack(f"!I{len(labels)}b", len(labels), *labels)
+
+
+def encode_error(request_id: int, status: int, detail: str) -> bytes:
+    return RESPONSE_HEADER.pack(request_id, status) + detail.encode()
+
+
+def decode_response(payload: bytes) -> tuple[int, int, list[int] | str]:
+    """(request_id, status, метки) при status == 200, иначе (request_id, status, текст ошибки)."""
+    request_id, status = RESPONSE_HEADER.unpack_from(payload)
+    offset = RESPONSE_HEADER.size
+    if status != STATUS_OK:
+        return request_id, status, payload[offset:].decode()
+
+    (count,) = struct.unpack_from("!I", payload, offset)
+    return request_id, status, list(struct.unpack_from(f"!{count}b", payload, offset + 4))
+
+
+async def read_frame(reader) -> bytes | None:
+    """Читает кадр из asyncio.StreamReader, None - если соединение закрыто."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except EOFError:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame too large: {size}")
+    return await reader.readexactly(size)
+
+
+def recv_frame(sock) -> bytes:
+    """Читает кадр из блокирующего сокета."""
+    (size,) = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame too large: {size}")
+    return _recv_exactly(sock, size)
+
+
+def _recv_exactly(sock, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Inference server closed the connection")
+        buffer += chunk
+    return bytes(buffer)
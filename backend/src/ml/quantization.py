@@ -0,0 +1,11 @@
+import torch
+import torch.nn as nn
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """
+    Динамическая int8-квантизация слоёв Linear и LSTM.
+    Веса хранятся в int8, активации квантуются на лету; работает только на CPU.
+    """
+    model.eval()
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear, nn.LSTM}, dtype=torch.qint8)
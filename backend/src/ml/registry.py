@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+from fastapi import HTTPException
+from loguru import logger
+
+
+class ModelRegistry:
+    """
+    Реестр моделей с ленивой загрузкой.
+
+    Модель загружается при первом обращении или заранее (load_all в lifespan),
+    сразу после загрузки прогревается и только потом считается готовой.
+    preload загружает модели без прогрева - в мастер-процессе перед fork
+    воркеров; каждый воркер прогревает их уже у себя при первом get.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._loading = set()
+        self._errors = {}
+        self._preloaded = {}
+        self._defer_warmup = False
+        # RLock: загрузчик одной модели может запросить из реестра другую
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader, warmup=None):
+        self._loaders[name] = (loader, warmup)
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._loaders)
+
+    def get(self, name: str):
+        """Возвращает загруженную модель, при необходимости загружая её в текущем потоке."""
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise HTTPException(404, f"Unknown model: {name}")
+
+        with self._lock:
+            if name not in self._models:
+                loader, warmup = self._loaders[name]
+                self._loading.add(name)
+                try:
+                    loaded = self._preloaded.pop(name) if name in self._preloaded else loader()
+                    if self._defer_warmup:
+                        self._preloaded[name] = loaded
+                        return loaded
+                    if warmup is not None:
+                        warmup(loaded)
+                except Exception as exc:
+                    self._errors[name] = repr(exc)
+                    raise
+                finally:
+                    self._loading.discard(name)
+                self._models[name] = loaded
+                self._errors.pop(name, None)
+
+        return self._models[name]
+
+    async def aget(self, name: str):
+        if name in self._models:
+            return self._models[name]
+        return await asyncio.to_thread(self.get, name)
+
+    def load_all(self):
+        for name in self._loaders:
+            try:
+                self.get(name)
+            except Exception:
+                # ошибка сохранена в status(), readiness останется false
+                logger.exception(f"failed to load model {name}")
+
+    def preload(self):
+        """
+        Загружает все модели без прогрева: прогон модели запускает пулы потоков
+        torch/OpenMP, которые не переживают fork.
+        """
+        with self._lock:
+            self._defer_warmup = True
+            try:
+                self.load_all()
+            finally:
+                self._defer_warmup = False
+
+    def is_ready(self, lazy: bool = False) -> bool:
+        """
+        Все модели загружены и прогреты. lazy - модели грузятся по первому
+        запросу (MODEL_PRELOAD=false): процесс готов принимать трафик сразу,
+        не готов только при ошибке загрузки.
+        """
+        if lazy:
+            return not self._errors
+        return all(name in self._models for name in self._loaders)
+
+    def status(self) -> dict:
+        status = {}
+        for name in self._loaders:
+            if name in self._models:
+                status[name] = "ready"
+            elif name in self._loading:
+                status[name] = "loading"
+            elif name in self._errors:
+                status[name] = f"failed: {self._errors[name]}"
+            else:
+                status[name] = "not_loaded"
+        return status
+
+
+registry = ModelRegistry()
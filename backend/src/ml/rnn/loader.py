@@ -0,0 +1,68 @@
+import torch
+from src.ml.rnn.model import BaseModel
+from src.ml.tokenizer import MyTokenizer
+from src.ml.vocab import load_word2ind
+from src.config import config
+from src.ml.cache import PredictionCache, file_version
+from src.ml.quantization import quantize_dynamic_int8
+from src.ml.weights import load_weights
+
+device = 'cpu'
+
+
+def load_vocab():
+    return load_word2ind(config.RNN_VOCAB_PATH)
+
+
+def load_tokenizer():
+    return MyTokenizer(load_vocab())
+
+
+def load_model(word2ind, quantization: str = "none", engine: str = "torch"):
+    if engine == "onnx":
+        from src.ml.onnx_engine import OnnxBaseModel
+
+        return OnnxBaseModel(
+            config.RNN_ONNX_MODEL_PATH,
+            intra_op_threads=config.ORT_INTRA_OP_THREADS,
+            inter_op_threads=config.ORT_INTER_OP_THREADS,
+        )
+
+    model = BaseModel(
+        hidden_dim=256,
+        vocab_size=len(word2ind),
+        num_classes=3,
+        lstm_layers=2,
+        aggregation_type='max+mean'
+        ).to(device)
+
+    # assign=True: параметры ссылаются на mmap-страницы файла весов, а не копируются
+    model.load_state_dict(load_weights(config.RNN_WEIGHTS_PATH), assign=True)
+    model.eval()
+
+    if quantization == "int8":
+        model = quantize_dynamic_int8(model)
+    return model
+
+
+def warmup_rnn(rnn, batch_sizes=(1, 64), lengths=(16, 64, 256)):
+    """Прогоняет модель на типичных размерах батча, чтобы первые запросы не платили за инициализацию."""
+    with torch.no_grad():
+        for batch_size in batch_sizes:
+            for length in lengths:
+                input_ids = torch.full((batch_size, length), rnn.tokenizer.unk_id, dtype=torch.long)
+                rnn.model.forward_packed(input_ids, torch.full((batch_size,), length, dtype=torch.long))
+
+
+# "packed": метки forward_packed не совпадают с прежним батчевым forward, старый кэш не переиспользуется
+model_version = "rnn-packed-" + (config.MODEL_VERSION or file_version(config.RNN_WEIGHTS_PATH, config.RNN_VOCAB_PATH))
+if config.INFERENCE_ENGINE == "onnx":
+    model_version += "-onnx-" + file_version(config.RNN_ONNX_MODEL_PATH)
+elif config.MODEL_QUANTIZATION != "none":
+    model_version += "-" + config.MODEL_QUANTIZATION
+
+prediction_cache = PredictionCache(
+    model_version=model_version,
+    max_size=config.PREDICTION_CACHE_SIZE,
+    disk_path=config.PREDICTION_CACHE_PATH or None,
+) if config.PREDICTION_CACHE_SIZE > 0 else None
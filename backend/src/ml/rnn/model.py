@@ -0,0 +1,65 @@
+import torch
+import torch.nn as nn
+
+class BaseModel(nn.Module):
+    def __init__(
+        self, hidden_dim, vocab_size, num_classes,
+        aggregation_type: str = 'max', lstm_layers: int = 1
+        ):
+        super().__init__()
+        self.embedding = nn.Embedding(vocab_size, hidden_dim)
+        self.gru = nn.LSTM(hidden_dim, hidden_dim, num_layers=lstm_layers, bidirectional=True)
+        self.linear = nn.Linear(hidden_dim * 2 * 2, hidden_dim)
+        self.projection = nn.Linear(hidden_dim, num_classes)
+
+        self.non_lin = nn.Tanh()
+        self.dropout = nn.Dropout(p=0.3)
+
+        self.aggregation_type = aggregation_type
+
+    def forward(self, input_batch) -> torch.Tensor:
+        """
+        Логиты для батча строк одинаковой длины, каждая строка считается
+        независимо от остальных. Прямой прогон (batch, seq) через LSTM без
+        batch_first смешивал бы строки батча между собой, поэтому forward -
+        частный случай forward_packed; для одного текста результат прежний.
+        """
+        lengths = torch.full((input_batch.shape[0],), input_batch.shape[1], dtype=torch.long)
+        return self.forward_packed(input_batch, lengths)
+
+    def forward_packed(self, input_ids, lengths) -> torch.Tensor:
+        """
+        Логиты для батча (batch, seq) с длинами строк lengths - те же, что при
+        прогоне каждого текста отдельно через forward(text[None]).
+
+        LSTM создана без batch_first, поэтому на тексте формы (1, seq) каждый
+        токен проходит через неё как последовательность длины 1. Здесь через
+        LSTM одним вызовом идут только настоящие токены всех строк (паддинг не
+        считается), а пулинг max/mean берётся по маске длины каждой строки.
+        Результат не зависит ни от состава батча, ни от порядка строк в нём.
+        """
+        mask = torch.arange(input_ids.shape[1]) < lengths[:, None]
+        states, _ = self.gru(self.embedding(input_ids[mask])[None])
+
+        output = states.new_zeros((*input_ids.shape, states.shape[-1]))
+        output[mask] = states[0]
+
+        max_pool = output.masked_fill(~mask[..., None], float("-inf")).max(dim=1)[0]
+        mean_pool = output.sum(dim=1) / lengths[:, None].clamp(min=1)
+
+        if self.aggregation_type == 'max':
+            output = max_pool
+        elif self.aggregation_type == 'mean':
+            output = mean_pool
+        elif self.aggregation_type == 'max+mean':
+            output = torch.cat([max_pool, mean_pool], dim=1)
+        else:
+            raise ValueError("Invalid aggregation_type")
+
+        return self.head(output)
+
+    def head(self, output) -> torch.Tensor:
+        output = self.dropout(self.linear(self.non_lin(output)))
+        prediction = self.projection(self.non_lin(output))
+
+        return prediction
\ No newline at end of file
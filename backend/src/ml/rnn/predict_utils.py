@@ -0,0 +1,155 @@
+import torch
+import numpy as np
+from src.ml.pipeline import run_pipeline
+from src.ml.rnn.loader import prediction_cache
+from src.ml.get_metrics_by_train import metrics_from_predictions
+from src.ml.predict_for_table import count_rows
+from src.report_storage import ReportWriter, write_report
+import pandas as pd
+
+device = 'cpu'
+
+
+def iter_batches(input_ids, lengths, batch_size=64):
+    """
+    Батчи строк input_ids, отсортированных по длине: (index, input_ids, lengths),
+    где index - исходные номера строк батча, а input_ids обрезаны по самой
+    длинной строке батча.
+    """
+    order = np.argsort(lengths, kind="stable")
+    for start in range(0, len(order), batch_size):
+        index = order[start:start + batch_size]
+        batch_lengths = lengths[index]
+        batch = input_ids[index, :batch_lengths.max()]
+        yield index, torch.from_numpy(batch), torch.from_numpy(batch_lengths.astype(np.int64))
+
+
+def predict_logits(model, input_ids, lengths, batch_size=64, progress=None):
+    """
+    Логиты для строк, закодированных MyTokenizer.encode_batch, в исходном порядке строк.
+    Батчи собираются из строк близкой длины и прогоняются через forward_packed.
+    """
+    logits = None
+    model.eval()
+    with torch.no_grad():
+        for index, batch, batch_lengths in iter_batches(input_ids, lengths, batch_size):
+            batch_logits = model.forward_packed(batch.to(device), batch_lengths.to(device)).cpu().numpy()
+            if logits is None:
+                logits = np.zeros((len(lengths), batch_logits.shape[1]), dtype=batch_logits.dtype)
+            logits[index] = batch_logits
+            if progress is not None:
+                progress(len(index))
+
+    if logits is None:
+        return np.zeros((0, 3), dtype=np.float32)
+    return logits
+
+
+def predict_encoded(model, input_ids, lengths, batch_size=64, progress=None):
+    """Метки для строк, закодированных MyTokenizer.encode_batch."""
+    return predict_logits(model, input_ids, lengths, batch_size, progress).argmax(axis=1).astype(np.int64)
+
+
+def predict_texts(model, tokenizer, texts, batch_size=64, max_length=256, progress=None, cache=prediction_cache):
+    """
+    Метки для списка текстов в исходном порядке.
+    Через модель идут только тексты, которых нет в cache.
+    progress(rows) вызывается после каждого батча.
+    """
+    texts = [str(text) for text in texts]
+    cached = cache.get_many(texts) if cache is not None else [None] * len(texts)
+    missed = [i for i, label in enumerate(cached) if label is None]
+    labels = np.array([-1 if label is None else label for label in cached], dtype=np.int64)
+
+    if progress is not None:
+        progress(len(texts) - len(missed))
+    if not missed:
+        return labels
+
+    input_ids, lengths = tokenizer.encode_batch([texts[i] for i in missed], max_length=max_length)
+    predictions = predict_encoded(model, input_ids, lengths, batch_size=batch_size, progress=progress)
+
+    labels[missed] = predictions
+    if cache is not None:
+        cache.put_many([texts[i] for i in missed], predictions)
+    return labels
+
+
+def predict_proba(model, tokenizer, texts, batch_size=64, max_length=256):
+    """Softmax-вероятности классов для списка текстов, массив формы (len(texts), num_classes)."""
+    input_ids, lengths = tokenizer.encode_batch(texts, max_length=max_length)
+    logits = torch.from_numpy(predict_logits(model, input_ids, lengths, batch_size))
+    return torch.softmax(logits, dim=1).numpy()
+
+
+def get_metrics_by_train(model, tokenizer, table, text_col="text", label_col="label"):
+    predictions = predict_texts(model, tokenizer, table[text_col].tolist())
+    targets = table[label_col].astype(int).tolist()
+
+    return metrics_from_predictions(targets, predictions)
+
+
+def predict_for_table(model, tokenizer, path_to_table, path_to_save, text_col="text", progress=None):
+    """
+    Размечает таблицу и сохраняет её с колонкой label.
+    progress(processed_rows, total_rows) вызывается после каждого батча.
+    """
+    table_df = pd.read_csv(path_to_table)
+    processed_rows = 0
+
+    def on_batch(rows):
+        nonlocal processed_rows
+        processed_rows += rows
+        if progress is not None:
+            progress(processed_rows, len(table_df))
+
+    table_df['label'] = predict_texts(model, tokenizer, table_df[text_col].tolist(), progress=on_batch)
+
+    write_report(table_df, path_to_save)
+
+
+def predict_for_table_stream(model, tokenizer, path_to_table, path_to_save, batch_size=64, text_col="text",
+                             chunk_rows=2048, queue_size=2, progress=None, cache=prediction_cache):
+    """
+    Потоковый вариант predict_for_table с постоянным расходом памяти.
+
+    Таблица читается чанками по chunk_rows строк; чтение, токенизация, инференс
+    и дозапись результата в parquet идут параллельно, связанные очередями на
+    queue_size чанков. Отчёт пишется через ReportWriter и появляется в
+    path_to_save только целиком.
+    """
+    model.eval()
+    total_rows = count_rows(path_to_table) if progress is not None else 0
+
+    def tokenize(chunk):
+        texts = chunk[text_col].astype(str).tolist()
+        labels = cache.get_many(texts) if cache is not None else [None] * len(texts)
+        missed = [i for i, label in enumerate(labels) if label is None]
+        missed_texts = [texts[i] for i in missed]
+        return chunk, labels, missed, missed_texts, tokenizer.encode_batch(missed_texts, max_length=256)
+
+    def infer(item):
+        chunk, labels, missed, missed_texts, (input_ids, lengths) = item
+        predictions = predict_encoded(model, input_ids, lengths, batch_size=batch_size).tolist()
+        for i, pred in zip(missed, predictions):
+            labels[i] = pred
+        if cache is not None and missed:
+            cache.put_many(missed_texts, predictions)
+        chunk['label'] = labels
+        return chunk
+
+    processed_rows = 0
+
+    def write(chunk):
+        nonlocal processed_rows
+        writer.write(chunk)
+        processed_rows += len(chunk)
+        if progress is not None:
+            progress(processed_rows, total_rows)
+
+    with ReportWriter(path_to_save) as writer:
+        run_pipeline(pd.read_csv(path_to_table, chunksize=chunk_rows), [tokenize, infer], write, queue_size=queue_size)
+
+        if processed_rows == 0:
+            writer.write(pd.read_csv(path_to_table, nrows=0).assign(label=[]))
+
@@ -1,12 +1,64 @@
 import re
+from itertools import chain, repeat
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r'\w+')
+
 
 class MyTokenizer:
     def __init__(self, word2ind):
         self.word2ind = word2ind
-        pass
+        self.unk_id = word2ind['<unk>']
+        self.pad_id = word2ind['<pad>']
+        self.bos_id = word2ind['<bos>']
+        self.eos_id = word2ind['<eos>']
+
     def tokenize(self, text):
-        return [x.lower() for x in re.findall(r'\w+', text)]
+        return [x.lower() for x in WORD_PATTERN.findall(text)]
 
     def encode(self, text):
-        tokens = [self.word2ind.get(word, self.word2ind['<unk>']) for word in self.tokenize(text)]
-        return tokens
\ No newline at end of file
+        tokens = [self.word2ind.get(word, self.unk_id) for word in self.tokenize(text)]
+        return tokens
+
+    def lookup(self, words) -> np.ndarray:
+        """id для списка слов, неизвестные слова -> <unk>. Цикл по словам идёт в C (map + fromiter)."""
+        if hasattr(self.word2ind, "lookup"):
+            return self.word2ind.lookup(words, self.unk_id)
+        return np.fromiter(map(self.word2ind.get, words, repeat(self.unk_id)), dtype=np.int64, count=len(words))
+
+    def encode_batch(self, texts, add_special_tokens=True, max_length=None):
+        """
+        Кодирует список или pd.Series текстов за один вызов.
+
+        Возвращает input_ids формы (len(texts), max_len) с паддингом <pad>
+        и lengths - реальные длины строк. С add_special_tokens строка
+        обрамляется <bos>/<eos>, как при обучении LSTM; max_length обрезает
+        строки справа.
+        """
+        # регистр понижается сразу для всего текста, а не для каждого слова
+        words = [WORD_PATTERN.findall(str(text).lower()) for text in texts]
+        offset = 1 if add_special_tokens else 0
+        if max_length is not None:
+            # слова дальше max_length всё равно отрезаются: одна длинная строка не должна раздувать весь массив
+            words = [row[:max(max_length - offset, 0)] for row in words]
+        word_counts = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        ids = self.lookup(list(chain.from_iterable(words)))
+
+        lengths = word_counts + 2 * offset
+        width = int(lengths.max()) if len(lengths) else 0
+        if max_length is not None:
+            width = min(width, max_length)
+
+        input_ids = np.full((len(lengths), width), self.pad_id, dtype=np.int64)
+        columns = np.arange(width)
+        # построчный порядок маски совпадает с порядком слов в ids
+        input_ids[(columns >= offset) & (columns < (word_counts + offset)[:, None])] = ids
+        if add_special_tokens and len(lengths):
+            input_ids[:, :1] = self.bos_id
+            # <eos> обрезанной строки не помещается, как и при обрезке справа
+            rows = np.flatnonzero(lengths <= width)
+            input_ids[rows, lengths[rows] - 1] = self.eos_id
+
+        lengths = np.minimum(lengths, width)
+        return input_ids, lengths
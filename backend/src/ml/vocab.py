@@ -0,0 +1,95 @@
+import argparse
+import os
+import pickle
+
+import numpy as np
+
+WORDS_FILE = "words.npy"
+IDS_FILE = "ids.npy"
+
+
+class MappedVocab:
+    """
+    Словарь word -> id для MyTokenizer поверх двух .npy, открытых через mmap.
+
+    words.npy - отсортированные слова в UTF-8 (массив фиксированной ширины),
+    ids.npy - их id. Поиск - бинарный (np.searchsorted), python-объектов на
+    каждое слово словаря нет, а страницы файлов общие для всех воркеров.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.words = np.load(os.path.join(path, WORDS_FILE), mmap_mode="r")
+        self.ids = np.load(os.path.join(path, IDS_FILE), mmap_mode="r")
+        self.width = self.words.dtype.itemsize
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word) -> bool:
+        return self.get(word) is not None
+
+    def __getitem__(self, word) -> int:
+        value = self.get(word)
+        if value is None:
+            raise KeyError(word)
+        return value
+
+    def get(self, word, default=None):
+        value = int(self._lookup_keys([word.encode()], -1)[0])
+        return default if value < 0 else value
+
+    def _lookup_keys(self, keys, default) -> np.ndarray:
+        result = np.full(len(keys), default, dtype=np.int64)
+        # слово длиннее самого длинного в словаре точно неизвестно, а приведение
+        # запроса к ширине словаря не копирует сам словарь
+        fits = np.flatnonzero(np.fromiter(map(len, keys), dtype=np.int64, count=len(keys)) <= self.width)
+        if not len(fits):
+            return result
+
+        query = np.array([keys[i] for i in fits], dtype=self.words.dtype)
+        positions = np.minimum(np.searchsorted(self.words, query), len(self.words) - 1)
+        found = self.words[positions] == query
+        result[fits[found]] = self.ids[positions[found]]
+        return result
+
+    def lookup(self, words, default) -> np.ndarray:
+        """id для списка слов, неизвестные слова -> default."""
+        # в тексте уникальных слов на порядки меньше, чем токенов: бинарный поиск только по ним
+        unique = list(dict.fromkeys(words))
+        ids = self._lookup_keys([word.encode() for word in unique], default)
+        local = dict(zip(unique, ids.tolist()))
+        return np.fromiter(map(local.__getitem__, words), dtype=np.int64, count=len(words))
+
+
+def convert_vocab(path_to_pickle: str, path_to_save: str):
+    """Переводит word2ind из save_data_new.pkl в формат MappedVocab."""
+    with open(path_to_pickle, "rb") as file:
+        word2ind = pickle.load(file)[0]
+
+    items = sorted((word.encode(), index) for word, index in word2ind.items())
+    os.makedirs(path_to_save, exist_ok=True)
+    np.save(os.path.join(path_to_save, WORDS_FILE), np.array([word for word, _ in items]))
+    np.save(os.path.join(path_to_save, IDS_FILE), np.array([index for _, index in items], dtype=np.int32))
+
+
+def load_word2ind(path: str):
+    """Каталог в формате MappedVocab открывается через mmap, иначе path - старый pickle."""
+    if os.path.isdir(path):
+        return MappedVocab(path)
+    with open(path, "rb") as file:
+        return pickle.load(file)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the pickled LSTM vocabulary to a memory-mappable format")
+    parser.add_argument("--input", default="src/ml/save_data_new.pkl")
+    parser.add_argument("--output", default="src/ml/rnn/vocab")
+    args = parser.parse_args()
+
+    convert_vocab(args.input, args.output)
+    print(f"saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
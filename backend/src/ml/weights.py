@@ -0,0 +1,46 @@
+import argparse
+import os
+
+import torch
+from safetensors.torch import load_file, save_file
+
+from src.config import config
+
+
+def load_weights(path: str) -> dict:
+    """
+    state_dict весов без копирования в память процесса.
+
+    .safetensors и .pt/.pth (zip-формат torch.save) открываются через mmap:
+    тензоры ссылаются на страницы файла, которые общие для всех процессов
+    (page cache) и для воркеров после fork. Чтобы модель не скопировала их,
+    state_dict нужно загружать с assign=True.
+    """
+    if path.endswith(".safetensors"):
+        return load_file(path, device="cpu")
+    return torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+
+
+def convert_weights(path: str, output: str):
+    state_dict = torch.load(path, map_location="cpu", weights_only=True)
+    # safetensors не хранит общие storage и непрерывность, поэтому каждому тензору - свой буфер
+    save_file({name: tensor.contiguous().clone() for name, tensor in state_dict.items()}, output)
+
+
+def main():
+    defaults = {"rubert": config.RUBERT_WEIGHTS_PATH, "rnn": config.RNN_WEIGHTS_PATH}
+
+    parser = argparse.ArgumentParser(description="Convert pickled torch weights to safetensors")
+    parser.add_argument("--model", choices=sorted(defaults), default="rubert")
+    parser.add_argument("--input", default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    path = args.input or defaults[args.model]
+    output = args.output or os.path.splitext(path)[0] + ".safetensors"
+    convert_weights(path, output)
+    print(f"saved {output}, set {args.model.upper()}_WEIGHTS_PATH={output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from src.report_exports import ENCODING_SUFFIXES, export_dir, export_path
+from src.report_index import index_path
+from src.report_storage import legacy_report_path, report_path, stats_path, upload_path
+
+
+def _link(source: Path, target: Path):
+    """Жёсткая ссылка target -> source; если ФС их не умеет - копия."""
+    tmp_path = Path(f"{target}.{uuid.uuid4().hex}.part")
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
+
+
+def link_report_files(source_id: uuid.UUID, report_id: uuid.UUID):
+    """
+    Файлы готового отчёта source_id под именами report_id, без повторной разметки.
+
+    Файлы - жёсткие ссылки на те же inode: данные на диске одни, а счётчик
+    ссылок ведёт файловая система. Удаление отчёта убирает только его имена,
+    поэтому данные живут, пока на них ссылается хоть один отчёт. Перезаписи
+    безопасны: файлы отчёта всегда заменяются через os.replace, а не правятся
+    на месте. json-ответ не переносится - в нём id и created_at самого отчёта.
+    """
+    paths = [path for path in (report_path, legacy_report_path, stats_path) if path(source_id).exists()]
+    if report_path not in paths and legacy_report_path not in paths:
+        raise FileNotFoundError(report_path(source_id))
+    for path in paths:
+        _link(path(source_id), path(report_id))
+
+    if index_path(source_id).exists():
+        tmp_path = Path(f"{index_path(report_id)}.{uuid.uuid4().hex}.part")
+        os.makedirs(tmp_path)
+        for name in os.listdir(index_path(source_id)):
+            _link(index_path(source_id) / name, tmp_path / name)
+        shutil.rmtree(index_path(report_id), ignore_errors=True)
+        os.replace(tmp_path, index_path(report_id))
+
+    etag_path = export_dir(source_id) / "report.csv.etag"
+    if etag_path.exists():
+        os.makedirs(export_dir(report_id), exist_ok=True)
+        for encoding in ENCODING_SUFFIXES:
+            _link(export_path(source_id, "csv", encoding), export_path(report_id, "csv", encoding))
+        # .etag последним: по нему экспорт считается готовым
+        _link(etag_path, export_dir(report_id) / "report.csv.etag")
+
+
+def link_done_report(source_ids, report_id: uuid.UUID) -> uuid.UUID | None:
+    """Берёт файлы первого из source_ids, которые ещё на месте; None - разметку придётся выполнить."""
+    for source_id in source_ids:
+        try:
+            link_report_files(source_id, report_id)
+            return source_id
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def delete_report_files(report_id: uuid.UUID):
+    """Удаляет имена файлов отчёта; данные, на которые ссылаются другие отчёты, остаются."""
+    for path in (report_path, legacy_report_path, stats_path, upload_path):
+        path(report_id).unlink(missing_ok=True)
+    shutil.rmtree(index_path(report_id), ignore_errors=True)
+    shutil.rmtree(export_dir(report_id), ignore_errors=True)
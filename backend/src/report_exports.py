@@ -0,0 +1,86 @@
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+import pyarrow as pa
+
+from src.config import config
+from src.report_storage import PREDICTION_COLUMNS, iter_report_csv, iter_report_json
+
+# Content-Encoding -> суффикс файла; identity - несжатый вариант
+ENCODING_SUFFIXES = {"identity": "", "zstd": ".zst", "gzip": ".gz"}
+# сжатые варианты в порядке предпочтения при равном q в Accept-Encoding
+ENCODINGS = ("zstd", "gzip")
+
+
+def export_dir(report_id: uuid.UUID) -> Path:
+    return Path(config.DATA_PATH) / f"{report_id}.export"
+
+
+def export_path(report_id: uuid.UUID, kind: str, encoding: str = "identity") -> Path:
+    return export_dir(report_id) / f"report.{kind}{ENCODING_SUFFIXES[encoding]}"
+
+
+def _etag_path(report_id: uuid.UUID, kind: str) -> Path:
+    return export_dir(report_id) / f"report.{kind}.etag"
+
+
+def build_report_export(report_id: uuid.UUID, kind: str, fields: dict | None = None) -> str:
+    """
+    Готовый ответ /reports/{kind}/{id} (kind - csv или json) и его gzip/zstd
+    варианты: пишутся одним проходом по отчёту, после этого отдаются с диска
+    как есть. Возвращает хэш содержимого, из которого строятся ETag'и.
+
+    Файлы пишутся под временными именами; .etag переименовывается последним
+    и означает, что все варианты на месте.
+    """
+    if kind == "csv":
+        chunks = iter_report_csv(report_id)
+    else:
+        chunks = iter_report_json(report_id, fields or {}, PREDICTION_COLUMNS)
+
+    os.makedirs(export_dir(report_id), exist_ok=True)
+    tag = uuid.uuid4().hex
+    tmp_paths = {encoding: f"{export_path(report_id, kind, encoding)}.{tag}.part" for encoding in ENCODING_SUFFIXES}
+    files = [
+        pa.OSFile(path, "wb") if encoding == "identity" else pa.CompressedOutputStream(path, encoding)
+        for encoding, path in tmp_paths.items()
+    ]
+    digest = hashlib.sha256()
+    try:
+        for chunk in chunks:
+            digest.update(chunk)
+            for f in files:
+                f.write(chunk)
+    except BaseException:
+        for f, path in zip(files, tmp_paths.values()):
+            f.close()
+            os.remove(path)
+        raise
+    for f in files:
+        f.close()
+    for encoding, path in tmp_paths.items():
+        os.replace(path, export_path(report_id, kind, encoding))
+
+    etag = digest.hexdigest()[:32]
+    etag_path = _etag_path(report_id, kind)
+    with open(f"{etag_path}.{tag}.part", "w") as f:
+        f.write(etag)
+    os.replace(f"{etag_path}.{tag}.part", etag_path)
+    return etag
+
+
+def build_report_exports(report_id: uuid.UUID, fields: dict):
+    """Все готовые ответы отчёта; вызывается один раз, когда отчёт размечен."""
+    build_report_export(report_id, "csv")
+    build_report_export(report_id, "json", fields)
+
+
+def read_report_export(report_id: uuid.UUID, kind: str, fields: dict | None = None) -> str:
+    """Хэш готового ответа; отчёты, созданные до появления экспорта, собираются при первом запросе."""
+    try:
+        with open(_etag_path(report_id, kind)) as f:
+            return f.read()
+    except FileNotFoundError:
+        return build_report_export(report_id, kind, fields)
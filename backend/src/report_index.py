@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import uuid
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from src.config import config
+from src.report_storage import ReportWriter, legacy_report_path, report_path
+
+LABELS = (0, 1, 2)
+
+
+def index_path(report_id: uuid.UUID) -> Path:
+    return Path(config.DATA_PATH) / f"{report_id}.index"
+
+
+def _group_rows(codes: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Номера строк, сгруппированные по коду (CSR): rows[offsets[c]:offsets[c + 1]] - строки с кодом c."""
+    rows = np.argsort(codes, kind="stable").astype(np.int32)
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=size), out=offsets[1:])
+    return rows, offsets
+
+
+def build_report_index(report_id: uuid.UUID, batch_rows: int = 65536):
+    """
+    Строит индексы отчёта один раз после разметки: label -> строки,
+    src -> строки и перестановки строк для сортировок. Всё хранится в
+    {id}.index/ как .npy и открывается через mmap.
+
+    Отчёт читается по record batch'ам: в памяти только числовые массивы
+    длиной в отчёт, текст - не больше одного батча.
+    """
+    if not report_path(report_id).exists() and legacy_report_path(report_id).exists():
+        # старый csv-отчёт переводим в parquet, чтобы страницы читались по row group'ам
+        with ReportWriter(report_path(report_id)) as writer:
+            for chunk in pd.read_csv(legacy_report_path(report_id), chunksize=config.REPORT_CHUNK_ROWS):
+                writer.write(chunk)
+
+    parquet = pq.ParquetFile(report_path(report_id))
+    num_rows = parquet.metadata.num_rows
+    labels = np.empty(num_rows, dtype=np.uint8)
+    src_codes = np.empty(num_rows, dtype=np.int32)
+    ids = np.empty(num_rows, dtype=np.int64)
+    lengths = np.empty(num_rows, dtype=np.int32)
+    src_values: dict[str, int] = {}
+    start = 0
+    for batch in parquet.iter_batches(batch_size=batch_rows, columns=["ID", "text", "src", "label"]):
+        end = start + len(batch)
+        labels[start:end] = batch["label"].to_numpy()
+        # строки без ID - в конце сортировки
+        ids[start:end] = pc.fill_null(batch["ID"], np.iinfo(np.int64).max).to_numpy()
+        lengths[start:end] = pc.fill_null(pc.utf8_length(batch["text"]), 0).to_numpy()
+        src = pc.fill_null(batch["src"].cast(pa.string()), "").dictionary_encode()
+        batch_codes = np.array([src_values.setdefault(value, len(src_values)) for value in src.dictionary.to_pylist()],
+                               dtype=np.int32)
+        src_codes[start:end] = batch_codes[src.indices.to_numpy()]
+        start = end
+
+    # коды src - в порядке значений, чтобы src_rows были сортировкой по src
+    names = sorted(src_values)
+    remap = np.empty(len(names), dtype=np.int32)
+    remap[[src_values[name] for name in names]] = np.arange(len(names))
+    src_codes = remap[src_codes]
+
+    arrays = {}
+    arrays["label_rows"], arrays["label_offsets"] = _group_rows(labels, len(LABELS))
+    arrays["src_rows"], arrays["src_offsets"] = _group_rows(src_codes, len(names))
+    arrays["order_ID"] = np.argsort(ids, kind="stable").astype(np.int32)
+    arrays["order_length"] = np.argsort(lengths, kind="stable").astype(np.int32)
+
+    path = index_path(report_id)
+    tmp_path = Path(f"{path}.{uuid.uuid4().hex}.part")
+    os.makedirs(tmp_path)
+    try:
+        for name, array in arrays.items():
+            np.save(tmp_path / f"{name}.npy", array)
+        with open(tmp_path / "meta.json", "w") as f:
+            json.dump({"num_rows": num_rows, "src_values": names}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        # индекс успел построить параллельный запрос - отчёт тот же, индекс тоже
+        if not path.exists():
+            raise
+
+
+class ReportIndex:
+    """Индексы одного отчёта (см. build_report_index), массивы открыты через mmap."""
+
+    def __init__(self, report_id: uuid.UUID):
+        path = index_path(report_id)
+        if not path.exists():
+            build_report_index(report_id)
+
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+        self.report_id = report_id
+        self.num_rows = meta["num_rows"]
+        self.src_codes = {value: code for code, value in enumerate(meta["src_values"])}
+        self._arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r")
+            for name in ("label_rows", "label_offsets", "src_rows", "src_offsets", "order_ID", "order_length")
+        }
+
+    def _rows(self, key: str, codes) -> np.ndarray:
+        rows, offsets = self._arrays[f"{key}_rows"], self._arrays[f"{key}_offsets"]
+        return np.concatenate([rows[offsets[code]:offsets[code + 1]] for code in codes] or [np.zeros(0, np.int32)])
+
+    def order(self, sort: str) -> np.ndarray:
+        if sort == "row":
+            return np.arange(self.num_rows, dtype=np.int32)
+        if sort in ("label", "src"):
+            return self._arrays[f"{sort}_rows"]
+        return self._arrays[f"order_{sort}"]
+
+    def mask(self, labels=None, sources=None) -> np.ndarray:
+        """Булева маска строк, подходящих под фильтры (внутри фильтра - ИЛИ, между фильтрами - И)."""
+        mask = np.ones(self.num_rows, dtype=bool)
+        if labels:
+            selected = np.zeros(self.num_rows, dtype=bool)
+            selected[self._rows("label", [label for label in set(labels) if label in LABELS])] = True
+            mask &= selected
+        if sources:
+            selected = np.zeros(self.num_rows, dtype=bool)
+            selected[self._rows("src", [self.src_codes[src] for src in set(sources) if src in self.src_codes])] = True
+            mask &= selected
+        return mask
+
+
+@lru_cache(maxsize=32)
+def search_mask(report_id: uuid.UUID, search: str) -> np.ndarray:
+    """Строки, в тексте которых есть search (без учёта регистра); отчёты не меняются, поэтому маска кэшируется."""
+    text = pq.read_table(report_path(report_id), columns=["text"])["text"]
+    matches = pc.fill_null(pc.match_substring(text, search, ignore_case=True), False)
+    mask = matches.to_numpy(zero_copy_only=False)
+    mask.flags.writeable = False
+    return mask
+
+
+def read_rows(report_id: uuid.UUID, rows: np.ndarray, columns: list[str]) -> list[dict]:
+    """Строки отчёта по номерам: читаются только row group'ы, в которые они попадают."""
+    parquet = pq.ParquetFile(report_path(report_id))
+    group_starts = np.cumsum([0] + [parquet.metadata.row_group(i).num_rows for i in range(parquet.num_row_groups)])
+    groups = np.searchsorted(group_starts, rows, side="right") - 1
+    needed = np.unique(groups)
+
+    table = parquet.read_row_groups(needed.tolist(), columns=columns)
+    # смещение каждой прочитанной группы внутри table
+    read_starts = np.cumsum([0] + [group_starts[g + 1] - group_starts[g] for g in needed[:-1]])
+    local = rows - group_starts[groups] + read_starts[np.searchsorted(needed, groups)]
+    return table.take(pa.array(local, type=pa.int64())).to_pylist()
+
+
+def query_rows(report_id: uuid.UUID, labels=None, sources=None, search: str | None = None, sort: str = "row",
+               descending: bool = False, cursor: int | None = None, limit: int = 50,
+               columns: list[str] = ("ID", "text", "src", "label")) -> dict:
+    """
+    Страница строк отчёта с фильтрами и сортировкой.
+
+    cursor - позиция последней отданной строки в выбранной сортировке; следующая
+    страница начинается сразу после неё, поэтому страницы не съезжают и не
+    повторяются. Фильтры по label и src считаются по индексам без чтения
+    файла, поиск по тексту читает только колонку text.
+    """
+    index = ReportIndex(report_id)
+    mask = index.mask(labels, sources)
+    if search:
+        mask &= search_mask(report_id, search)
+
+    order = index.order(sort)
+    if descending:
+        order = order[::-1]
+    positions = np.flatnonzero(mask[order])
+    start = 0 if cursor is None else np.searchsorted(positions, cursor, side="right")
+    page = positions[start:start + limit]
+
+    rows = read_rows(report_id, np.asarray(order[page], dtype=np.int64), list(columns)) if len(page) else []
+    has_more = start + limit < len(positions)
+    return {
+        "total": int(len(positions)),
+        "next_cursor": int(page[-1]) if has_more else None,
+        "rows": rows,
+    }
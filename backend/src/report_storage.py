@@ -0,0 +1,274 @@
+import io
+import json
+import os
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from src.config import config
+
+# row group'ы - единица чтения страниц отчёта (src.report_index.read_rows)
+ROW_GROUP_ROWS = 8192
+
+# типы известных колонок отчёта; остальные колонки загруженного csv хранятся строками
+COLUMN_TYPES = {
+    "ID": pa.int64(),
+    "text": pa.string(),
+    "src": pa.dictionary(pa.int32(), pa.string()),
+    "label": pa.uint8(),
+}
+
+# колонки отчёта, которые отдаются клиенту
+PREDICTION_COLUMNS = ["ID", "text", "src", "label"]
+# колонки, без которых отчёт не собрать: label дописывает модель
+UPLOAD_COLUMNS = [name for name in PREDICTION_COLUMNS if name != "label"]
+
+
+def upload_path(report_id: uuid.UUID) -> Path:
+    """Загруженный пользователем csv, из которого строится отчёт."""
+    return Path(config.DATA_PATH) / f"{report_id}.upload.csv"
+
+
+def report_path(report_id: uuid.UUID) -> Path:
+    return Path(config.DATA_PATH) / f"{report_id}.parquet"
+
+
+def legacy_report_path(report_id: uuid.UUID) -> Path:
+    """Отчёты, сохранённые до перехода на parquet."""
+    return Path(config.DATA_PATH) / f"{report_id}.csv"
+
+
+def stats_path(report_id: uuid.UUID) -> Path:
+    return Path(config.DATA_PATH) / f"{report_id}.stats.json"
+
+
+def upload_error(contents: bytes) -> str | None:
+    """
+    Почему из загруженного csv не собрать отчёт, или None. Кроме колонок
+    проверяется ID: он хранится как int64 (COLUMN_TYPES), и нечисловой ID
+    уронил бы задачу только после разметки.
+    """
+    try:
+        columns = pd.read_csv(io.BytesIO(contents), nrows=0).columns
+        missing = [name for name in UPLOAD_COLUMNS if name not in columns]
+        if missing:
+            return f"Missing columns: {', '.join(missing)}"
+        ids = pd.read_csv(io.BytesIO(contents), usecols=["ID"])["ID"]
+    except (ValueError, UnicodeDecodeError):
+        return "File is not a valid csv"
+    try:
+        pa.array(ids, from_pandas=True).cast(COLUMN_TYPES["ID"])
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return "Column ID must contain integers"
+    return None
+
+
+def to_arrow(table_df: pd.DataFrame) -> pa.Table:
+    # тип прочих колонок pandas выводит по каждому чанку отдельно (пустая в первом чанке
+    # колонка - float, дальше в ней строки), а схема parquet-файла одна на все чанки
+    extra = {name: "string" for name in table_df.columns if name not in COLUMN_TYPES}
+    table = pa.Table.from_pandas(table_df.astype(extra), preserve_index=False)
+    for name in table.column_names:
+        type_ = COLUMN_TYPES.get(name, pa.string())
+        column = table[name]
+        if name == "src":
+            # src без значения - "", как ключ в агрегатах и индексе: по нему же и фильтруются строки
+            column = pc.fill_null(column.cast(pa.string()), "")
+        if pa.types.is_dictionary(type_):
+            column = column.cast(type_.value_type).dictionary_encode().cast(type_)
+        else:
+            column = column.cast(type_)
+        table = table.set_column(table.column_names.index(name), name, column)
+    return table
+
+
+class ReportStats:
+    """
+    Агрегаты отчёта для дашборда: число строк по меткам, в целом и по src.
+    Считаются по чанкам (np.bincount по кодам src и меткам), пока отчёт пишется.
+    """
+
+    num_labels = 3
+
+    def __init__(self):
+        self.labels = np.zeros(self.num_labels, dtype=np.int64)
+        self.sources: dict[str, np.ndarray] = {}
+
+    def update(self, table: pa.Table):
+        if "label" not in table.column_names or not len(table):
+            return
+        labels = table["label"].to_numpy().astype(np.int64)
+        self.labels += np.bincount(labels, minlength=self.num_labels)[:self.num_labels]
+        if "src" not in table.column_names:
+            return
+
+        src = pc.fill_null(table["src"].cast(pa.string()), "").combine_chunks().dictionary_encode()
+        codes = src.indices.to_numpy().astype(np.int64)
+        counts = np.bincount(codes * self.num_labels + labels, minlength=len(src.dictionary) * self.num_labels)
+        for name, row in zip(src.dictionary.to_pylist(), counts.reshape(-1, self.num_labels)):
+            self.sources[name] = self.sources.get(name, 0) + row[:self.num_labels]
+
+    def to_dict(self) -> dict:
+        def counts(labels):
+            return {"total": int(labels.sum()), "labels": {str(label): int(n) for label, n in enumerate(labels)}}
+
+        return counts(self.labels) | {"sources": {name: counts(labels) for name, labels in sorted(self.sources.items())}}
+
+    def save(self, path):
+        tmp_path = f"{path}.{uuid.uuid4().hex}.part"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ReportWriter:
+    """
+    Пишет отчёт в parquet чанками (row group'ами не длиннее ROW_GROUP_ROWS строк)
+    и попутно считает ReportStats; агрегаты сохраняются рядом, в .stats.json.
+
+    Данные идут во временный файл, который подменяет path только при
+    успешном закрытии, так что читатели никогда не видят недописанный отчёт.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        # у каждого писателя свой временный файл: отчёт могут собирать параллельно
+        self.tmp_path = f"{self.path}.{uuid.uuid4().hex}.part"
+        self.stats_path = Path(self.path).with_suffix(".stats.json")
+        self.stats = ReportStats()
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+
+    def write(self, chunk: pd.DataFrame):
+        table = to_arrow(chunk)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.tmp_path, self._schema, compression="zstd")
+        else:
+            table = table.cast(self._schema)
+        self._writer.write_table(table, row_group_size=ROW_GROUP_ROWS)
+        self.stats.update(table)
+        self.rows += len(chunk)
+
+    def close(self):
+        self._writer.close()
+        self.stats.save(self.stats_path)
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_report(table_df: pd.DataFrame, path):
+    with ReportWriter(path) as writer:
+        writer.write(table_df)
+
+
+def read_report(report_id: uuid.UUID, columns: list[str] | None = None) -> pa.Table:
+    """Отчёт как arrow-таблица; columns - читать только эти колонки."""
+    path = report_path(report_id)
+    if path.exists():
+        return pq.read_table(path, columns=columns)
+
+    legacy_path = legacy_report_path(report_id)
+    if legacy_path.exists():
+        return to_arrow(pd.read_csv(legacy_path, usecols=columns))
+    raise FileNotFoundError(path)
+
+
+def read_report_stats(report_id: uuid.UUID) -> dict:
+    """Агрегаты отчёта; для отчётов без .stats.json считаются один раз по колонкам label и src."""
+    path = stats_path(report_id)
+    if not path.exists():
+        stats = ReportStats()
+        stats.update(read_report(report_id, ["src", "label"]))
+        stats.save(path)
+    with open(path) as f:
+        return json.load(f)
+
+
+def report_exists(report_id: uuid.UUID) -> bool:
+    return report_path(report_id).exists() or legacy_report_path(report_id).exists()
+
+
+def iter_report_batches(report_id: uuid.UUID, columns: list[str] | None = None, batch_rows: int = 8192):
+    """Отчёт по record batch'ам до batch_rows строк: в памяти не больше одного батча."""
+    path = report_path(report_id)
+    if path.exists():
+        yield from pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns)
+    else:
+        yield from read_report(report_id, columns).to_batches(max_chunksize=batch_rows)
+
+
+def _json_rows(batch: pa.RecordBatch, lines: bool) -> str:
+    # to_json кодирует батч целиком в C, без python-словаря на строку;
+    # целые с пропусками остаются целыми, а не float (ID 1, а не 1.0)
+    return batch.to_pandas(integer_object_nulls=True).to_json(orient="records", lines=lines, force_ascii=False)
+
+
+def iter_report_ndjson(report_id: uuid.UUID, columns: list[str] | None = None, batch_rows: int = 8192):
+    """Строки отчёта в NDJSON: по json-объекту на строку."""
+    for batch in iter_report_batches(report_id, columns, batch_rows):
+        if len(batch):
+            rows = _json_rows(batch, lines=True)
+            yield (rows if rows.endswith("\n") else rows + "\n").encode()
+
+
+def iter_report_json(report_id: uuid.UUID, fields: dict, columns: list[str] | None = None, batch_rows: int = 8192):
+    """
+    JSON вида {**fields, "prediction": [...]}, который пишется по батчам:
+    тот же ответ, что у /reports/json, но без сборки всего отчёта в памяти.
+    """
+    head = json.dumps(fields, ensure_ascii=False, default=str)[:-1]
+    yield (head + (", " if fields else "") + '"prediction": [').encode()
+    first = True
+    for batch in iter_report_batches(report_id, columns, batch_rows):
+        if len(batch):
+            rows = _json_rows(batch, lines=False)[1:-1]
+            yield (rows if first else "," + rows).encode()
+            first = False
+    yield b"]}"
+
+
+def iter_report_csv(report_id: uuid.UUID, batch_rows: int = 8192):
+    """csv отчёта, собираемый на лету по row group'ам, без промежуточного файла."""
+    path = report_path(report_id)
+    if not path.exists():
+        with open(legacy_report_path(report_id), "rb") as f:
+            yield from iter(lambda: f.read(2 ** 16), b"")
+        return
+
+    parquet = pq.ParquetFile(path)
+    include_header = True
+    for batch in parquet.iter_batches(batch_size=batch_rows):
+        sink = pa.BufferOutputStream()
+        # csv не умеет dictionary-колонки, раскрываем их в строки
+        batch = pa.RecordBatch.from_arrays(
+            [column.dictionary_decode() if pa.types.is_dictionary(column.type) else column for column in batch.columns],
+            names=batch.schema.names,
+        )
+        pa_csv.write_csv(batch, sink, write_options=pa_csv.WriteOptions(include_header=include_header))
+        include_header = False
+        yield sink.getvalue().to_pybytes()
+
+    if include_header:
+        yield (",".join(parquet.schema_arrow.names) + "\n").encode()
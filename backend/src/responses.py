@@ -0,0 +1,80 @@
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse на orjson: кодирует в C и сразу в utf-8 (кириллица не
+    экранируется), понимает uuid, datetime и numpy без jsonable_encoder.
+
+    Если вернуть его из эндпоинта напрямую, FastAPI не валидирует ответ через
+    response_model - так отдаются строки отчёта, типы которых уже приведены
+    при записи (src.report_storage.COLUMN_TYPES).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def parse_accept_encoding(header: str | None) -> dict[str, float]:
+    """Accept-Encoding -> {кодировка: q}."""
+    weights = {}
+    for item in (header or "").split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.lower()] = q
+    return weights
+
+
+def choose_encoding(header: str | None, available) -> str:
+    """
+    Сжатие для ответа по Accept-Encoding: из available (в порядке предпочтения
+    сервера) берётся принятое клиентом с наибольшим q, иначе identity.
+    """
+    weights = parse_accept_encoding(header)
+    best, best_q = "identity", 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match сравнивается слабо (RFC 9110, 13.1.2): W/ не учитывается."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def cached_file_response(request: Request, path, etag: str, encoding: str, media_type: str,
+                         headers: dict | None = None) -> Response:
+    """
+    Отдаёт неизменяемый файл: 304, если у клиента он уже есть (If-None-Match),
+    иначе FileResponse, который сам обрабатывает Range и If-Range.
+    """
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        # кэшировать можно, но перед использованием - проверить ETag: отчёт могли удалить
+        "Cache-Control": "private, no-cache",
+    } | (headers or {})
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -1,72 +1,264 @@
-import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import hashlib
+import os
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
 from fastapi import UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from src.schemas.sentimental_report_schema import (
-    SentimentalReportCreate, SentimentalReportRead, SentimentalReportReadPreds
+    SentimentalReportCreate, SentimentalReportRead, SentimentalReportReadPreds, SentimentalReportRows, SentimentalReportStats, ReportJobRead
 )
 from src.services.sentimental_report_service import SentimentalReportService
+from src.services.report_job_service import ReportJobService, get_report_job_service
+from src.services.report_upload_service import ReportUploadService, get_report_upload_service
 from src.services.user_service import UserService
 from src.services.sentimental_report_service import get_report_service
 from src.services.user_service import get_user_service
 
-from src.ml.model import model, tokenizer
-from src.ml.predict_for_table import predict_for_table
+from src.ml.engines import registry, get_model_name, model_versions
 
 
+from src.ml.executor import report_executor
+from src.db.session import async_session_maker
 from src.security import User, get_authorized_user
 from src.config import config
+from src.report_storage import (
+    PREDICTION_COLUMNS, upload_path, report_path, report_exists, read_report_stats,
+    iter_report_json, iter_report_ndjson, upload_error,
+)
+from src.report_index import build_report_index, query_rows
+from src.report_exports import ENCODINGS, build_report_export, build_report_exports, export_path, read_report_export
+from src.report_artifacts import delete_report_files, link_done_report
+from src.responses import FastJSONResponse, cached_file_response, choose_encoding
+from typing import Literal
 from pathlib import Path
 import uuid
+from loguru import logger
+
+router = APIRouter(prefix="/reports", tags=["Sentimental Reports"], default_response_class=FastJSONResponse)
+
+
+def report_fields(report_orm) -> dict:
+    """Поля отчёта, которые идут в /reports/json перед строками."""
+    return {"id": str(report_orm.id), "created_at": report_orm.created_at.isoformat()}
+
+
+async def report_export_response(request: Request, report_id: uuid.UUID, kind: str, media_type: str,
+                                 fields: dict | None = None, headers: dict | None = None):
+    """Готовый ответ отчёта с диска: сжатие по Accept-Encoding, ETag, 304 и Range."""
+    if not report_exists(report_id):
+        raise HTTPException(404, "Report not found")
+    digest = await asyncio.to_thread(read_report_export, report_id, kind, fields)
+    encoding = choose_encoding(request.headers.get("accept-encoding"), ENCODINGS)
+    # strong ETag у каждого варианта свой: байты сжатых файлов различаются
+    etag = f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+    return cached_file_response(request, export_path(report_id, kind, encoding), etag, encoding, media_type, headers)
+
+
+async def run_report_job(report_id: uuid.UUID, table_path: Path, model_name: str, source_ids=()):
+    loop = asyncio.get_running_loop()
+    last_percent = -1
+
+    async def update_job(update):
+        # на каждое обновление своя короткая сессия: разметка может идти минутами
+        async with async_session_maker() as session:
+            await update(ReportJobService(session))
 
-router = APIRouter(prefix="/reports", tags=["Sentimental Reports"])
+    async def save_progress(processed_rows: int, total_rows: int):
+        await update_job(lambda jobs: jobs.set_progress(report_id, processed_rows, total_rows))
+
+    def on_progress(processed_rows: int, total_rows: int):
+        # вызывается из потока инференса, пишем в бд не чаще раза на процент
+        nonlocal last_percent
+        percent = 100 * processed_rows // max(total_rows, 1)
+        if percent != last_percent:
+            last_percent = percent
+            asyncio.run_coroutine_threadsafe(save_progress(processed_rows, total_rows), loop)
+
+    async def heartbeat():
+        # по пульсу живые задачи отличаются от брошенных при перезапуске (см. watch_stale_jobs)
+        while True:
+            await asyncio.sleep(config.REPORT_JOB_HEARTBEAT_SECONDS)
+            try:
+                await update_job(lambda jobs: jobs.touch(report_id))
+            except Exception:
+                logger.exception(f"report job {report_id} heartbeat failed")
+
+    await update_job(lambda jobs: jobs.set_status(report_id, "running"))
+    beat = asyncio.create_task(heartbeat())
+    try:
+        # тот же файл уже размечен той же моделью: берём готовый отчёт вместо инференса
+        source_id = await asyncio.to_thread(link_done_report, source_ids, report_id)
+        if source_id is None:
+            engine = await registry.aget(model_name)
+            if config.REPORT_STREAMING:
+                await report_executor.submit(
+                    engine.predict_for_table_stream,
+                    path_to_table=table_path, path_to_save=report_path(report_id),
+                    chunk_rows=config.REPORT_CHUNK_ROWS, progress=on_progress
+                )
+            else:
+                await report_executor.submit(
+                    engine.predict_for_table,
+                    path_to_table=table_path, path_to_save=report_path(report_id),
+                    progress=on_progress
+                )
+            await asyncio.to_thread(build_report_index, report_id)
+        async with async_session_maker() as session:
+            report_orm = await SentimentalReportService(session).get(report_id)
+        if source_id is None:
+            await asyncio.to_thread(build_report_exports, report_id, report_fields(report_orm))
+        else:
+            # индекс и csv общие с исходным отчётом, а в json - id и created_at нового
+            await asyncio.to_thread(build_report_export, report_id, "json", report_fields(report_orm))
+            total_rows = (await asyncio.to_thread(read_report_stats, report_id))["total"]
+            await save_progress(total_rows, total_rows)
+    except Exception as exc:
+        logger.exception(f"report job {report_id} failed")
+        await update_job(lambda jobs: jobs.set_status(report_id, "failed", error=str(exc)))
+        return
+    finally:
+        beat.cancel()
+    # загруженный csv больше не нужен: отчёт целиком лежит в parquet
+    os.remove(table_path)
+    await update_job(lambda jobs: jobs.set_status(report_id, "done"))
 
 
 @router.post("/", response_model=SentimentalReportCreate)
 async def create_report(
+    background_tasks: BackgroundTasks,
     input_file: UploadFile = File(...),
+    model_name: str = Depends(get_model_name),
     report_service: SentimentalReportService = Depends(get_report_service),
+    job_service: ReportJobService = Depends(get_report_job_service),
+    upload_service: ReportUploadService = Depends(get_report_upload_service),
     user_service: UserService = Depends(get_user_service),
     current_user: User = Depends(get_authorized_user)
 ):
     user = await user_service.get(current_user.id)
 
+    contents = await input_file.read()
+    error = await asyncio.to_thread(upload_error, contents)
+    if error:
+        raise HTTPException(400, error)
+
     report = SentimentalReportCreate(user_id=current_user.id, id=uuid.uuid4())
 
     await report_service.create(report)
 
-    predictions_path = Path(config.DATA_PATH) / (str(report.id) + ".csv")
-    with open(predictions_path, "wb") as f:
-        f.write(await input_file.read())
+    table_path = upload_path(report.id)
+    with open(table_path, "wb") as f:
+        f.write(contents)
 
-    predict_for_table(model=model, tokenizer=tokenizer, path_to_table=predictions_path, path_to_save=predictions_path)
+    await job_service.create(report.id)
+    content_hash = hashlib.sha256(contents).hexdigest()
+    model_version = model_versions[model_name]
+    source_ids = await upload_service.find_done(content_hash, model_version) if config.REPORT_DEDUP else []
+    await upload_service.create(report.id, content_hash, model_version)
+    background_tasks.add_task(run_report_job, report.id, table_path, model_name, source_ids)
     return report
 
 
+@router.get("/status/{report_id}", response_model=ReportJobRead)
+async def get_report_status(
+    report_id: uuid.UUID,
+    current_user: User = Depends(get_authorized_user),
+    job_service: ReportJobService = Depends(get_report_job_service)
+):
+    return await job_service.get_or_404(report_id)
+
+
 @router.get("/csv/{report_id}", response_model=SentimentalReportRead)
 async def download_report_csv(
+    request: Request,
     report_id: uuid.UUID,
-    current_user: User = Depends(get_authorized_user)
+    current_user: User = Depends(get_authorized_user),
+    job_service: ReportJobService = Depends(get_report_job_service)
 ):
-    filepath = Path(config.DATA_PATH) / (str(report_id) + ".csv")
-    return FileResponse(path=filepath, filename='classification_results.csv', media_type='multipart/form-data')
+    await job_service.ensure_done(report_id)
+    return await report_export_response(
+        request, report_id, "csv", media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="classification_results.csv"'},
+    )
+
 
 @router.get("/json/{report_id}", response_model=SentimentalReportReadPreds)
 async def get_report_json(
+    request: Request,
     report_id: uuid.UUID,
+    stream: bool = Query(False, description="Писать ответ по частям, не собирая весь отчёт в памяти"),
     current_user: User = Depends(get_authorized_user),
-    service: SentimentalReportService = Depends(get_report_service)
+    service: SentimentalReportService = Depends(get_report_service),
+    job_service: ReportJobService = Depends(get_report_job_service)
 ):
-    filepath = Path(config.DATA_PATH) / (str(report_id) + ".csv")
-    predictions = pd.read_csv(filepath).to_dict("records")
-    print(predictions)
+    await job_service.ensure_done(report_id)
     report_orm = await service.get(report_id)
+    if report_orm is None:
+        raise HTTPException(404, "Report not found")
+    if stream:
+        if not report_exists(report_id):
+            raise HTTPException(404, "Report not found")
+        return StreamingResponse(
+            iter_report_json(report_id, report_fields(report_orm), PREDICTION_COLUMNS), media_type="application/json"
+        )
+
+    # ответ собран и сжат при создании отчёта, SentimentPrediction на каждую строку не строится
+    return await report_export_response(
+        request, report_id, "json", media_type="application/json", fields=report_fields(report_orm)
+    )
+
+
+@router.get("/ndjson/{report_id}")
+async def get_report_ndjson(
+    report_id: uuid.UUID,
+    current_user: User = Depends(get_authorized_user),
+    job_service: ReportJobService = Depends(get_report_job_service)
+):
+    """Строки отчёта в NDJSON: отдаются по мере чтения файла, по батчу за раз."""
+    await job_service.ensure_done(report_id)
+    if not report_exists(report_id):
+        raise HTTPException(404, "Report not found")
+    return StreamingResponse(iter_report_ndjson(report_id, PREDICTION_COLUMNS), media_type="application/x-ndjson")
 
-    report = SentimentalReportReadPreds(id=report_id, created_at=report_orm.created_at, prediction=predictions)
-    return report
 
+@router.get("/rows/{report_id}", response_model=SentimentalReportRows)
+async def get_report_rows(
+    report_id: uuid.UUID,
+    label: list[int] | None = Query(None, description="Оставить строки с этими метками"),
+    src: list[str] | None = Query(None, description="Оставить строки из этих источников"),
+    q: str | None = Query(None, description="Подстрока текста без учёта регистра"),
+    sort: Literal["row", "ID", "label", "src", "length"] = "row",
+    order: Literal["asc", "desc"] = "asc",
+    cursor: int | None = Query(None, description="next_cursor предыдущей страницы"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_authorized_user),
+    job_service: ReportJobService = Depends(get_report_job_service)
+):
+    """Страница строк отчёта: фильтры по label и src считаются по индексам отчёта, файл не сканируется."""
+    await job_service.ensure_done(report_id)
+    try:
+        page = await asyncio.to_thread(
+            query_rows, report_id, labels=label, sources=src, search=q, sort=sort,
+            descending=order == "desc", cursor=cursor, limit=limit
+        )
+    except FileNotFoundError:
+        raise HTTPException(404, "Report not found")
+    return FastJSONResponse({"id": report_id} | page)
 
 
+@router.get("/stats/{report_id}", response_model=SentimentalReportStats)
+async def get_report_stats(
+    report_id: uuid.UUID,
+    current_user: User = Depends(get_authorized_user),
+    job_service: ReportJobService = Depends(get_report_job_service)
+):
+    """Число отзывов по тональностям, в целом и по каждому src; считается при создании отчёта."""
+    await job_service.ensure_done(report_id)
+    try:
+        stats = await asyncio.to_thread(read_report_stats, report_id)
+    except FileNotFoundError:
+        raise HTTPException(404, "Report not found")
+    return SentimentalReportStats(id=report_id, **stats)
+
 
 @router.get("/", response_model=list[SentimentalReportRead])
 async def get_reports(
@@ -89,4 +281,6 @@ async def delete_report(
     service: SentimentalReportService = Depends(get_report_service)
 ):
     report = await service.delete_by_id(report_id)
+    # файлы, общие с другими отчётами (см. link_report_files), остаются у них
+    await asyncio.to_thread(delete_report_files, report_id)
     return report
\ No newline at end of file
@@ -3,19 +3,21 @@ from src.schemas.sentimental_schema import (
     SentimentalCreateFromOne, SentimentalGet, SentimentalCalculatedF1Get
 )
 from fastapi import UploadFile, File
-from src.ml.model import tokenizer,model
-from src.ml.get_metrics_by_train import get_metrics_by_train
-from src.ml.predict_label import predict_label
+from src.ml.engines import registry, caches, get_model_name
+from src.ml.batching import predict_batchers
+from src.ml.executor import inference_executor
+from src.responses import FastJSONResponse
 import pandas as pd
 
-router = APIRouter(prefix="/predict-one", tags=["Sentimental"])
+router = APIRouter(prefix="/predict-one", tags=["Sentimental"], default_response_class=FastJSONResponse)
 
 
 @router.post("/", response_model=SentimentalGet)
 async def predict_one(
     data: SentimentalCreateFromOne,
+    model_name: str = Depends(get_model_name),
 ):
-    result = predict_label(model, tokenizer, texts=data.text)
+    result = await predict_batchers[model_name].predict(data.text)
 
     return SentimentalGet(predicted_mark=result, text=data.text)
 
@@ -23,14 +25,35 @@ async def predict_one(
 @router.post("/f1")
 async def predict_f1(
     input_file: UploadFile = File(...),
+    model_name: str = Depends(get_model_name),
 ):
     ### TODO добавить мл
     contents = await input_file.read()
     data = pd.read_csv(pd.io.common.BytesIO(contents))
 
 
-    result = get_metrics_by_train(model, data)
+    engine = await registry.aget(model_name)
+    result = await inference_executor.submit(engine.get_metrics, data)
 
     #return SentimentalCalculatedF1Get(f1=result)
     print(result)
-    return {"f1-macro": sum([result.get(0).get("f1"), result.get(1).get("f1"), result.get(2).get("f1")]) / 3} | result
\ No newline at end of file
+    return {"f1-macro": sum([result.get(0).get("f1"), result.get(1).get("f1"), result.get(2).get("f1")]) / 3} | result
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    return {
+        name: {"enabled": False} if cache is None else {"enabled": True} | cache.stats()
+        for name, cache in caches.items()
+    }
+
+
+@router.get("/cascade")
+async def get_cascade_stats():
+    if registry.status().get("cascade") != "ready":
+        return {"loaded": False}
+    cascade = await registry.aget("cascade")
+    if not hasattr(cascade, "stats"):
+        # INFERENCE_MODE=remote: каскад живёт в inference-server
+        return {"loaded": True, "remote": True}
+    return {"loaded": True} | cascade.stats()
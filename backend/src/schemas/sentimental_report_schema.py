@@ -1,6 +1,6 @@
 import uuid
 import datetime as dt
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from typing import Literal
 
 
@@ -32,3 +32,35 @@ class SentimentalReportReadPreds(SentimentalReportBase):
     created_at: dt.datetime
     prediction: list[SentimentPrediction]
 
+
+class SentimentalReportRows(SentimentalReportBase):
+    id: uuid.UUID
+    total: int
+    next_cursor: int | None = None
+    rows: list[SentimentPrediction]
+
+
+class LabelCounts(BaseModel):
+    total: int
+    labels: dict[int, int]
+
+
+class SentimentalReportStats(LabelCounts):
+    id: uuid.UUID
+    sources: dict[str, LabelCounts]
+
+
+class ReportJobRead(SentimentalReportBase):
+    report_id: uuid.UUID
+    status: Literal["pending", "running", "done", "failed"]
+    total_rows: int
+    processed_rows: int
+    error: str | None = None
+
+    @computed_field(return_type=float)
+    def progress(self):
+        if self.status == "done":
+            return 100.0
+        if not self.total_rows:
+            return 0.0
+        return round(100 * self.processed_rows / self.total_rows, 1)
@@ -0,0 +1,96 @@
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+from loguru import logger
+
+from src.config import config
+
+
+def run_worker(app, sock: socket.socket, args):
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, log_level=args.log_level))
+    server.run(sockets=[sock])
+
+
+def spawn(app, sock: socket.socket, args) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(app, sock, args)
+        except BaseException:
+            logger.exception("worker crashed")
+            code = 1
+        os._exit(code)
+    return pid
+
+
+def main():
+    """
+    Запуск API в несколько процессов по схеме preload + fork.
+
+    Мастер один раз импортирует приложение и загружает модели (веса открыты
+    через mmap, см. src.ml.weights), затем форкает воркеры. Воркеры делят
+    страницы весов и всех объектов мастера copy-on-write, поэтому RSS растёт
+    с числом воркеров медленнее, чем у uvicorn --workers, где каждый воркер
+    грузит модели заново. Прогрев и lifespan выполняются в каждом воркере.
+    """
+    parser = argparse.ArgumentParser(description="Run the API in pre-forked uvicorn workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FASTAPI_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=config.WEB_WORKERS)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    from src.main import app
+    from src.ml.engines import registry
+
+    if config.MODEL_PRELOAD:
+        registry.preload()
+        logger.info(f"preloaded models: {registry.status()}")
+    # объекты мастера уходят из-под сборщика мусора, иначе его проходы в воркерах
+    # трогают их заголовки и копируют страницы
+    gc.collect()
+    gc.freeze()
+
+    workers = {spawn(app, sock, args) for _ in range(args.workers)}
+    logger.info(f"started {len(workers)} workers on {args.host}:{args.port}")
+    stopping = False
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not stopping:
+            logger.warning(f"worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+            time.sleep(1)
+            workers.add(spawn(app, sock, args))
+
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import datetime as dt
+import uuid
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from src.db.tables import ReportJob
+from fastapi import Depends, HTTPException
+from src.config import config
+from src.db.session import get_session, async_session_maker
+
+
+class ReportJobService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, report_id: uuid.UUID) -> ReportJob:
+        job = ReportJob(report_id=report_id, status="pending")
+        self.session.add(job)
+        await self.session.commit()
+        await self.session.refresh(job)
+        return job
+
+    async def get_by_report(self, report_id: uuid.UUID) -> ReportJob | None:
+        query = select(ReportJob).where(ReportJob.report_id == report_id)
+        return await self.session.scalar(query)
+
+    async def get_or_404(self, report_id: uuid.UUID) -> ReportJob:
+        job = await self.get_by_report(report_id)
+        if job is None:
+            raise HTTPException(404, "Report job not found")
+        return job
+
+    async def ensure_done(self, report_id: uuid.UUID):
+        # отчёты, созданные до появления задач, считаем готовыми
+        job = await self.get_by_report(report_id)
+        if job is not None and job.status != "done":
+            raise HTTPException(409, f"Report is not ready: {job.status}")
+
+    async def set_status(self, report_id: uuid.UUID, status: str, error: str | None = None):
+        query = (
+            update(ReportJob)
+            .where(ReportJob.report_id == report_id)
+            .values(status=status, error=error)
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def set_progress(self, report_id: uuid.UUID, processed_rows: int, total_rows: int):
+        # обновления приходят из потока инференса и могут обогнать друг друга
+        query = (
+            update(ReportJob)
+            .where(ReportJob.report_id == report_id)
+            .values(
+                processed_rows=func.greatest(ReportJob.processed_rows, processed_rows),
+                total_rows=total_rows,
+            )
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def touch(self, report_id: uuid.UUID):
+        """Пульс задачи: обновляет updated_at, пока задача жива."""
+        query = update(ReportJob).where(ReportJob.report_id == report_id).values(updated_at=func.now())
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def fail_stale(self, timeout_seconds: float) -> int:
+        """
+        Помечает failed задачи, пульса которых не было дольше timeout_seconds:
+        их процесс перезапустили или он упал, доделывать их некому.
+        """
+        query = (
+            update(ReportJob)
+            .where(
+                ReportJob.status.in_(("pending", "running")),
+                ReportJob.updated_at < func.now() - dt.timedelta(seconds=timeout_seconds),
+            )
+            .values(status="failed", error="Report job was interrupted by a server restart")
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return result.rowcount
+
+
+async def watch_stale_jobs():
+    """Фоновая проверка брошенных задач: сразу при старте и дальше раз в REPORT_JOB_HEARTBEAT_SECONDS."""
+    while True:
+        try:
+            async with async_session_maker() as session:
+                failed = await ReportJobService(session).fail_stale(config.REPORT_JOB_TIMEOUT_SECONDS)
+            if failed:
+                logger.warning(f"marked {failed} interrupted report jobs as failed")
+        except Exception:
+            logger.exception("stale report job check failed")
+        await asyncio.sleep(config.REPORT_JOB_HEARTBEAT_SECONDS)
+
+
+def get_report_job_service(
+    session: AsyncSession = Depends(get_session),
+) -> ReportJobService:
+    return ReportJobService(session)
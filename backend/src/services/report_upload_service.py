@@ -0,0 +1,38 @@
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from src.db.tables import ReportJob, ReportUpload
+from fastapi import Depends
+from src.db.session import get_session
+
+
+class ReportUploadService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, report_id: uuid.UUID, content_hash: str, model_version: str) -> ReportUpload:
+        upload = ReportUpload(report_id=report_id, content_hash=content_hash, model_version=model_version)
+        self.session.add(upload)
+        await self.session.commit()
+        await self.session.refresh(upload)
+        return upload
+
+    async def find_done(self, content_hash: str, model_version: str) -> list[uuid.UUID]:
+        """Готовые отчёты по тому же файлу и той же версии модели, новые первыми."""
+        query = (
+            select(ReportUpload.report_id)
+            .join(ReportJob, ReportJob.report_id == ReportUpload.report_id)
+            .where(
+                ReportUpload.content_hash == content_hash,
+                ReportUpload.model_version == model_version,
+                ReportJob.status == "done",
+            )
+            .order_by(ReportUpload.created_at.desc())
+        )
+        return list(await self.session.scalars(query))
+
+
+def get_report_upload_service(
+    session: AsyncSession = Depends(get_session),
+) -> ReportUploadService:
+    return ReportUploadService(session)
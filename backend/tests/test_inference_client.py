@@ -0,0 +1,85 @@
+import socket
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from src.ml.inference_client import InferenceClient
+from src.ml.protocol import decode_request, encode_response, frame, recv_frame
+
+
+class FakeServer:
+    """Inference-сервер на unix-сокете: отвечает меткой 1 на каждый текст через delay секунд."""
+
+    def __init__(self, path, delay: float = 0):
+        self.delay = delay
+        self.requests = 0
+        self.connections = []
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(str(path))
+        self.listener.listen()
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections.append(conn)
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    request_id, _, texts = decode_request(recv_frame(conn))
+                    self.requests += 1
+                    time.sleep(self.delay)
+                    conn.sendall(frame(encode_response(request_id, [1] * len(texts))))
+                except OSError:
+                    # клиент не дождался ответа или сервер остановлен
+                    return
+
+    def close(self):
+        self.listener.close()
+        for conn in self.connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def test_timeout_is_not_retried(tmp_path):
+    server = FakeServer(tmp_path / "inference.sock", delay=0.5)
+    client = InferenceClient(str(tmp_path / "inference.sock"), timeout=0.1)
+
+    with pytest.raises(HTTPException) as exc:
+        client.predict("rubert", ["текст"])
+    assert exc.value.status_code == 504
+    time.sleep(0.1)
+    assert server.requests == 1
+    server.close()
+
+
+def test_reconnects_after_server_restart(tmp_path):
+    path = tmp_path / "inference.sock"
+    server = FakeServer(path)
+    client = InferenceClient(str(path), timeout=1)
+    assert client.predict("rubert", ["a"]) == [1]
+
+    # соединение клиента осталось от старого сервера, новый слушает тот же путь
+    server.close()
+    path.unlink()
+    restarted = FakeServer(path)
+    assert client.predict("rubert", ["a", "b"]) == [1, 1]
+    assert restarted.requests == 1
+    restarted.close()
+
+
+def test_unavailable_server(tmp_path):
+    client = InferenceClient(str(tmp_path / "missing.sock"), timeout=1)
+    with pytest.raises(HTTPException) as exc:
+        client.predict("rubert", ["a"])
+    assert exc.value.status_code == 503
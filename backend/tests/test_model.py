@@ -0,0 +1,44 @@
+import pytest
+import torch
+from safetensors.torch import save_file
+from transformers import BertConfig, BertForSequenceClassification
+
+from src.config import config
+from src.ml.model import load_model
+
+
+def tiny_bert(seed: int) -> BertForSequenceClassification:
+    torch.manual_seed(seed)
+    bert_config = BertConfig(vocab_size=100, hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                             intermediate_size=64, num_labels=3)
+    return BertForSequenceClassification(bert_config).eval()
+
+
+@pytest.mark.parametrize("suffix", [".pt", ".safetensors"])
+def test_load_model_uses_finetuned_weights(tmp_path, monkeypatch, suffix):
+    # в каталоге модели - базовые веса, дообученные лежат отдельным файлом
+    tiny_bert(seed=0).save_pretrained(tmp_path / "rubert_local")
+    finetuned = tiny_bert(seed=1)
+    weights_path = str(tmp_path / f"weights{suffix}")
+    if suffix == ".pt":
+        torch.save(finetuned.state_dict(), weights_path)
+    else:
+        save_file({name: tensor.contiguous() for name, tensor in finetuned.state_dict().items()}, weights_path)
+    monkeypatch.setattr(config, "RUBERT_WEIGHTS_PATH", weights_path)
+
+    model = load_model(model_dir=str(tmp_path / "rubert_local"))
+
+    input_ids = torch.randint(0, 100, (2, 7))
+    with torch.no_grad():
+        assert torch.allclose(model(input_ids=input_ids).logits, finetuned(input_ids=input_ids).logits)
+    assert not model.training
+
+
+def test_load_model_rejects_mismatched_weights(tmp_path, monkeypatch):
+    tiny_bert(seed=0).save_pretrained(tmp_path / "rubert_local")
+    weights_path = str(tmp_path / "weights.pt")
+    torch.save({"classifier.weight": torch.zeros(3, 32)}, weights_path)
+    monkeypatch.setattr(config, "RUBERT_WEIGHTS_PATH", weights_path)
+
+    with pytest.raises(RuntimeError, match="Missing key"):
+        load_model(model_dir=str(tmp_path / "rubert_local"))
@@ -0,0 +1,57 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.ml.engines import CascadeEngine, RnnEngine, RubertEngine, enabled_engines
+from src.ml.registry import ModelRegistry
+from src.routers import health_router
+
+
+def missing_weights():
+    raise FileNotFoundError("src/ml/rnn/full_model_state.pth")
+
+
+def readiness(registry: ModelRegistry, monkeypatch):
+    monkeypatch.setattr(health_router, "registry", registry)
+    app = FastAPI()
+    app.include_router(health_router.router)
+    return TestClient(app).get("/health/ready")
+
+
+def test_enabled_engines():
+    assert enabled_engines("rubert", "rubert") == [RubertEngine]
+    assert enabled_engines(" cascade, rnn,rubert ", "cascade") == [RubertEngine, RnnEngine, CascadeEngine]
+
+
+@pytest.mark.parametrize("names, default_model", [
+    ("rubert,bert", "rubert"),
+    ("rubert,cascade", "rubert"),
+    ("rubert", "rnn"),
+])
+def test_enabled_engines_rejects_bad_config(names, default_model):
+    with pytest.raises(ValueError):
+        enabled_engines(names, default_model)
+
+
+def test_ready_without_disabled_model(monkeypatch):
+    # ENABLED_MODELS=rubert: LSTM без весов не регистрируется и readiness его не ждёт
+    registry = ModelRegistry()
+    for engine in enabled_engines("rubert", "rubert"):
+        registry.register(engine.name, object)
+    registry.load_all()
+
+    response = readiness(registry, monkeypatch)
+    assert response.status_code == 200
+    assert response.json()["models"] == {"rubert": "ready"}
+
+
+def test_not_ready_when_enabled_model_is_missing(monkeypatch):
+    registry = ModelRegistry()
+    registry.register("rubert", object)
+    registry.register("rnn", missing_weights)
+    registry.load_all()
+
+    response = readiness(registry, monkeypatch)
+    assert response.status_code == 503
+    assert response.json()["models"]["rubert"] == "ready"
+    assert response.json()["models"]["rnn"].startswith("failed: FileNotFoundError")
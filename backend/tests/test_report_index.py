@@ -0,0 +1,22 @@
+import uuid
+
+import pandas as pd
+
+from src.config import config
+from src.report_index import query_rows
+from src.report_storage import read_report_stats, report_path, write_report
+
+
+def test_missing_src_matches_stats_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DATA_PATH", str(tmp_path))
+    report_id = uuid.uuid4()
+    write_report(pd.DataFrame({
+        "ID": [1, 2, 3], "text": ["a", "b", "c"], "src": ["geo", None, "geo"], "label": [0, 1, 2],
+    }), report_path(report_id))
+
+    sources = read_report_stats(report_id)["sources"]
+    assert sources[""]["total"] == 1
+
+    page = query_rows(report_id, sources=[""])
+    assert page["total"] == 1
+    assert page["rows"] == [{"ID": 2, "text": "b", "src": "", "label": 1}]
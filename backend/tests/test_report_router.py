@@ -0,0 +1,53 @@
+import datetime as dt
+import types
+import uuid
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import config
+from src.report_storage import report_path, write_report
+from src.routers.sentimental_report_router import router
+from src.security import User, get_authorized_user
+from src.services.report_job_service import get_report_job_service
+from src.services.sentimental_report_service import get_report_service
+
+
+class DoneJobs:
+    async def ensure_done(self, report_id):
+        pass
+
+
+class Reports:
+    def __init__(self, known: bool):
+        self.known = known
+
+    async def get(self, report_id):
+        if self.known:
+            return types.SimpleNamespace(id=report_id, created_at=dt.datetime(2025, 1, 1))
+        return None
+
+
+def client(known: bool) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_authorized_user] = lambda: User(id=uuid.uuid4())
+    app.dependency_overrides[get_report_job_service] = DoneJobs
+    app.dependency_overrides[get_report_service] = lambda: Reports(known)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_report_json_without_report_row(tmp_path, monkeypatch, stream):
+    monkeypatch.setattr(config, "DATA_PATH", str(tmp_path))
+    report_id = uuid.uuid4()
+    write_report(pd.DataFrame({"ID": [1], "text": ["a"], "src": ["x"], "label": [0]}), report_path(report_id))
+
+    params = {"stream": "true"} if stream else {}
+    assert client(known=False).get(f"/reports/json/{report_id}", params=params).status_code == 404
+
+    response = client(known=True).get(f"/reports/json/{report_id}", params=params)
+    assert response.status_code == 200
+    assert response.json()["prediction"] == [{"ID": 1, "text": "a", "src": "x", "label": 0}]
@@ -0,0 +1,24 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.report_storage import _json_rows, to_arrow, upload_error
+
+
+@pytest.mark.parametrize("contents, error", [
+    (b"ID,text,src\n1,a,x\n,b,y\n", None),
+    (b"ID,text,src,extra\n1.0,a,x,\n2,b,y,z\n", None),
+    (b"ID,text\n1,a\n", "Missing columns: src"),
+    (b"", "File is not a valid csv"),
+    (b"ID,text,src\na1,a,x\n", "Column ID must contain integers"),
+    (b"ID,text,src\n1.5,a,x\n", "Column ID must contain integers"),
+])
+def test_upload_error(contents, error):
+    assert upload_error(contents) == error
+
+
+def test_json_rows_keep_nullable_ids_integer():
+    table = to_arrow(pd.DataFrame({"ID": [1, None], "text": ["a", "b"], "src": ["x", "y"], "label": [0, 2]}))
+    rows = json.loads(_json_rows(table.to_batches()[0], lines=False))
+    assert [row["ID"] for row in rows] == [1, None]
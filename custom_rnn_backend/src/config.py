@@ -1,23 +0,0 @@
-import os
-from pydantic_settings import BaseSettings
-from pydantic import computed_field
-
-class Settings(BaseSettings):
-    POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "localhost")
-    POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "password")
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB", "sentimental_db")
-    API_PREFIX: str = os.getenv("API_PREFIX", "/sentimental-api")
-    DATA_PATH: str = os.getenv("DATA_PATH", "src/data/")
-    JWT_SECRET: str = os.getenv("JWT_SECRET", "meowmeow")
-
-    @computed_field(return_type=str)
-    def sync_db_connection(self):
-        return f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
-
-    @computed_field(return_type=str)
-    def async_db_connection(self):
-        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
-
-config = Settings()
\ No newline at end of file
@@ -1,11 +0,0 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from src.config import config
-
-engine = create_async_engine(config.async_db_connection, echo=False)
-
-async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-
-async def get_session() -> AsyncSession:
-    async with async_session_maker() as session:
-        yield session
\ No newline at end of file
@@ -1,63 +0,0 @@
-from pydantic import BaseModel
-device = 'cpu'
-import pickle
-from src.ml.tokenizer import *
-import torch
-from src.ml.loader import *
-
-
-
-tokenizer = MyTokenizer(word2ind)
-
-class CustomDataset:
-    def __init__(self, sentences, is_train=True):
-        self.is_train = is_train
-        self.data = sentences
-        self.unk_id = word2ind['<unk>']
-        self.bos_id = word2ind['<bos>']
-        self.eos_id = word2ind['<eos>']
-        self.pad_id = word2ind['<pad>']
-
-    def __getitem__(self, idx):
-        processed_text = tokenizer.tokenize(self.data[idx][1])
-        source = self.data[idx][2]
-
-        tokenized_sentence = [self.bos_id]
-        tokenized_sentence += [
-            word2ind.get(word, self.unk_id) for word in processed_text
-        ]
-        tokenized_sentence += [self.eos_id]
-
-        train_sample = {
-            "text": tokenized_sentence,
-            "source": source,
-            "label": (self.data[idx][3] if self.is_train else 0)
-        }
-
-        return train_sample
-
-    def __len__(self) -> int:
-        return len(self.data)
-
-
-def collate_fn_with_padding(input_batch, pad_id=word2ind['<pad>'], max_len=256):
-    seq_lens = [len(x['text']) for x in input_batch]
-    max_seq_len = min(max(seq_lens), max_len)
-
-    new_batch = []
-    for sequence in input_batch:
-        sequence['text'] = sequence['text'][:max_seq_len]
-        for _ in range(max_seq_len - len(sequence['text'])):
-            sequence['text'].append(pad_id)
-
-        new_batch.append(sequence['text'])
-
-    sequences = torch.LongTensor(new_batch).to(device)
-    labels = torch.LongTensor([x['label'] for x in input_batch]).to(device)
-
-    new_batch = {
-        'input_ids': sequences,
-        'label': labels
-    }
-
-    return new_batch
\ No newline at end of file
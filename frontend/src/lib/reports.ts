@@ -11,6 +11,19 @@ export type ReportUploadResponse = {
   id: string;
 };
 
+export type ReportJobStatus = {
+  report_id: string;
+  status: "pending" | "running" | "done" | "failed";
+  total_rows: number;
+  processed_rows: number;
+  progress: number;
+  error?: string | null;
+};
+
+const REPORT_POLL_INTERVAL_MS = 1000;
+// без новых строк дольше этого отчёт считаем зависшим
+const REPORT_STALL_TIMEOUT_MS = 10 * 60 * 1000;
+
 export type NormalizedReport = {
   id: string;
   createdAt: string;
@@ -35,8 +48,48 @@ export const fetchReportById = async (
   return normalizeReport(data, reportId);
 };
 
+export const fetchReportStatus = async (
+  reportId: string
+): Promise<ReportJobStatus> => {
+  const { data } = await api.get<ReportJobStatus>(
+    `/reports/status/${reportId}`
+  );
+  return data;
+};
+
+export const waitForReport = async (
+  reportId: string,
+  onProgress?: (status: ReportJobStatus) => void
+): Promise<ReportJobStatus> => {
+  let lastProcessed = -1;
+  let deadline = Date.now() + REPORT_STALL_TIMEOUT_MS;
+
+  for (;;) {
+    const status = await fetchReportStatus(reportId);
+    onProgress?.(status);
+
+    if (status.status === "done") {
+      return status;
+    }
+    if (status.status === "failed") {
+      throw new Error(status.error ?? "Не удалось обработать отчёт");
+    }
+    if (status.processed_rows !== lastProcessed) {
+      lastProcessed = status.processed_rows;
+      deadline = Date.now() + REPORT_STALL_TIMEOUT_MS;
+    } else if (Date.now() > deadline) {
+      throw new Error("Отчёт обрабатывается слишком долго, попробуйте позже");
+    }
+
+    await new Promise((resolve) =>
+      setTimeout(resolve, REPORT_POLL_INTERVAL_MS)
+    );
+  }
+};
+
 export const uploadReportFile = async (
-  file: File
+  file: File,
+  onProgress?: (status: ReportJobStatus) => void
 ): Promise<NormalizedReport> => {
   const formData = new FormData();
   formData.append("input_file", file);
@@ -51,6 +104,7 @@ export const uploadReportFile = async (
     throw new Error("Бэкенд не вернул идентификатор отчёта");
   }
 
+  await waitForReport(data.id, onProgress);
   return fetchReportById(data.id);
 };
 